@@ -4,15 +4,35 @@ Hourly updates - NEW jobs ADDED, old jobs KEPT
 Latest jobs always on top
 """
 
-import os, hashlib, re, sys
+import os, sys
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 import pandas as pd
-from jobspy import scrape_jobs
 import gspread
 from google.oauth2.service_account import Credentials
-import requests
-from bs4 import BeautifulSoup
+from search_executor import run_searches, print_search_report, search_key
+from search_watermarks import SearchWatermarks
+from known_jobs import KnownJobs, jobspy_uids
+from job_uids import uid_for, uids_for
+from jobspy_normaliser import normalise_jobs, now_iso
+from job_record import COLUMNS, records_frame, sheet_frame
+from hospital_engine import run_hospital_sources, print_hospital_report, DEADLINE as HOSPITAL_DEADLINE
+from http_session import print_connection_stats
+from rate_limiter import get_scheduler
+from http_cache import ResponseCache
+from source_health import SourceHealth
+from run_budget import RunBudget, YieldHistory
+import greenhouse
+import workday
+from hospital_adapters import load_hospital_sources, restamp_jobs
+from nursing_matcher import NURSING
+from near_duplicates import collapse_near_duplicates, print_duplicate_report
+from url_canon import JobKeyIndex
+from pipeline import Pipeline, Stage, print_pipeline_report
+from job_store import JobStore
+from sheet_sync import SheetSync
+from sheet_format import SheetLayout, ROW_TYPE_COLUMN
+from concurrent.futures import ThreadPoolExecutor
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
@@ -38,6 +58,10 @@ now = dt.now()
 
 HOURS_OLD = 24  # Last 24 hours (TODAY'S JOBS ONLY)
 ALL_PLATFORMS = ["indeed", "linkedin"]  # Naukri removed - blocked by recaptcha
+NURSING_FILTER = os.getenv("NURSING_FILTER", "1") == "1"  # Drop non-nursing JobSpy results
+SOURCE_BREAKER = os.getenv("SOURCE_BREAKER", "1") == "1"  # Skip hospital sources that keep failing
+NEAR_DUP_SIMILARITY = float(os.getenv("NEAR_DUP_SIMILARITY", "0.7"))  # 0 disables cross-platform dedup
+SHEET_FULL_REWRITE = os.getenv("SHEET_FULL_REWRITE", "0") == "1"  # Rewrite the whole sheet instead of a diff
 
 # Calculate the start date for display
 from datetime import timedelta
@@ -71,934 +95,183 @@ def log_status(message, status_type="INFO"):
 
 log_status("Agent initialization complete", "SUCCESS")
 
+# Hospital sources (hospitals.json) in the order their jobs are added to the sheet
+HOSPITAL_SOURCES = load_hospital_sources()
+
 # ============================================================================
-# HELPER FUNCTIONS
+# GOOGLE SHEETS - CONNECT AND READ (in the background while scraping runs)
 # ============================================================================
 
-def now_iso():
-    return datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
-
-def uid_for(row) -> str:
-    """Generate unique ID for deduplication"""
-    if isinstance(row, dict):
-        key = "|".join([
-            str(row.get("Job Title","")).strip().lower(),
-            str(row.get("Company Name","")).strip().lower(),
-            str(row.get("Location","")).strip().lower(),
-            str(row.get("Apply Link","")).strip().lower(),
-        ])
-    else:
-        key = "|".join([
-            str(row.get("Job Title") if hasattr(row, 'get') else row["Job Title"]).strip().lower(),
-            str(row.get("Company Name") if hasattr(row, 'get') else row["Company Name"]).strip().lower(),
-            str(row.get("Location") if hasattr(row, 'get') else row["Location"]).strip().lower(),
-            str(row.get("Apply Link") if hasattr(row, 'get') else row["Apply Link"]).strip().lower(),
-        ])
-    return hashlib.md5(key.encode("utf-8")).hexdigest()
-
-def scrape_greenhouse_jobs(api_url, company_name, location_filter=""):
-    """Scrape jobs from Greenhouse API"""
-    try:
-        response = requests.get(api_url, timeout=10)
-        if response.status_code != 200:
-            return []
-
-        data = response.json()
-        jobs = data.get('jobs', [])
-
-        hospital_jobs = []
-        for job in jobs:
-            title = job.get('title', '').lower()
-            location = job.get('location', {}).get('name', '') if isinstance(job.get('location'), dict) else str(job.get('location', ''))
-
-            # Filter for nursing jobs
-            if any(keyword in title for keyword in ['nurse', 'nursing', 'rn', 'registered nurse', 'staff nurse', 'clinical']):
-                # Filter by location if specified
-                if location_filter and location_filter.lower() not in location.lower():
-                    continue
-
-                hospital_jobs.append({
-                    'Job Title': job.get('title', ''),
-                    'Platform': company_name,
-                    'Company Name': company_name,
-                    'Description': job.get('content', '')[:500],
-                    'Location': location,
-                    'Work Model': '',
-                    'Published': now_iso().split('T')[0],
-                    'Salary': '',
-                    'Seniority': '',
-                    'Company Size': '',
-                    'Industry': 'Healthcare',
-                    'Apply Link': job.get('absolute_url', ''),
-                    'Source': f'{company_name} (Direct)',
-                    'Collected At': now_iso(),
-                    '_uid': ''
-                })
-
-        return hospital_jobs
-    except Exception as e:
-        print(f"Error scraping {company_name}: {e}")
-        return []
-
-def scrape_nmc_healthcare():
-    """Scrape NMC Healthcare careers via Greenhouse"""
-    print("\n[Hospital 1/6] Scraping NMC Healthcare...")
-    jobs = scrape_greenhouse_jobs(
-        "https://boards-api.greenhouse.io/v1/boards/nmchealthcare/jobs",
-        "NMC Healthcare",
-        location_filter="UAE"
-    )
-    print(f"Found {len(jobs)} nursing jobs from NMC Healthcare")
-    return jobs
-
-def scrape_kings_college():
-    """Scrape Kings College Hospital Dubai"""
-    print("\n[Hospital 2/6] Scraping Kings College Hospital...")
-    jobs = scrape_greenhouse_jobs(
-        "https://boards-api.greenhouse.io/v1/boards/kingscollegehospitaldubai/jobs",
-        "Kings College Hospital Dubai",
-        location_filter="Dubai"
-    )
-    print(f"Found {len(jobs)} nursing jobs from Kings College")
-    return jobs
-
-def scrape_burjeel_holdings():
-    """Scrape Burjeel Holdings careers"""
-    print("\n[Hospital 3/6] Scraping Burjeel Holdings...")
-    try:
-        url = "https://burjeelholdings.com/careers/"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-
-        if response.status_code != 200:
-            print("Could not access Burjeel careers page")
-            return []
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        jobs = []
-
-        # Look for job listings (adjust selectors based on actual page structure)
-        job_elements = soup.find_all(['div', 'article', 'li'], class_=re.compile(r'job|career|position', re.I))
-
-        for job_elem in job_elements[:20]:  # Limit to 20 jobs
-            title_elem = job_elem.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name|job', re.I))
-            if not title_elem:
-                continue
-
-            title = title_elem.get_text(strip=True)
-
-            # Filter for nursing jobs
-            if any(keyword in title.lower() for keyword in ['nurse', 'nursing', 'rn', 'registered nurse']):
-                link_elem = job_elem.find('a', href=True) or title_elem if title_elem.name == 'a' else None
-                apply_link = link_elem.get('href', url) if link_elem else url
-
-                if not apply_link.startswith('http'):
-                    apply_link = 'https://burjeelholdings.com' + apply_link
-
-                jobs.append({
-                    'Job Title': title,
-                    'Platform': 'Burjeel Holdings',
-                    'Company Name': 'Burjeel Holdings',
-                    'Description': '',
-                    'Location': 'UAE',
-                    'Work Model': '',
-                    'Published': now_iso().split('T')[0],
-                    'Salary': '',
-                    'Seniority': '',
-                    'Company Size': '',
-                    'Industry': 'Healthcare',
-                    'Apply Link': apply_link,
-                    'Source': 'Burjeel Holdings (Direct)',
-                    'Collected At': now_iso(),
-                    '_uid': ''
-                })
-
-        print(f"Found {len(jobs)} nursing jobs from Burjeel")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping Burjeel: {e}")
-        return []
-
-def scrape_mediclinic():
-    """Scrape Mediclinic Middle East careers"""
-    print("\n[Hospital 4/6] Scraping Mediclinic Middle East...")
-    try:
-        # Mediclinic uses Workday - try to access their careers API
-        url = "https://mediclinic.wd3.myworkdayjobs.com/wday/cxs/mediclinic/Mediclinic_Middle_East/jobs"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json'
-        }
-
-        payload = {
-            "appliedFacets": {},
-            "limit": 20,
-            "offset": 0,
-            "searchText": "nurse"
-        }
-
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
-
-        jobs = []
-        if response.status_code == 200:
-            data = response.json()
-            job_postings = data.get('jobPostings', [])
-
-            for job in job_postings:
-                title_obj = job.get('title', '')
-                title = title_obj if isinstance(title_obj, str) else ''
-
-                jobs.append({
-                    'Job Title': title,
-                    'Platform': 'Mediclinic',
-                    'Company Name': 'Mediclinic Middle East',
-                    'Description': '',
-                    'Location': job.get('locationsText', 'UAE'),
-                    'Work Model': '',
-                    'Published': now_iso().split('T')[0],
-                    'Salary': '',
-                    'Seniority': '',
-                    'Company Size': '',
-                    'Industry': 'Healthcare',
-                    'Apply Link': f"https://mediclinic.wd3.myworkdayjobs.com/Mediclinic_Middle_East{job.get('externalPath', '')}",
-                    'Source': 'Mediclinic (Direct)',
-                    'Collected At': now_iso(),
-                    '_uid': ''
-                })
-
-        print(f"Found {len(jobs)} nursing jobs from Mediclinic")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping Mediclinic: {e}")
-        return []
-
-def scrape_cleveland_clinic():
-    """Scrape Cleveland Clinic Abu Dhabi"""
-    print("\n[Hospital 5/6] Scraping Cleveland Clinic Abu Dhabi...")
-    try:
-        # Cleveland Clinic also uses Workday
-        url = "https://clevelandclinic.wd5.myworkdayjobs.com/wday/cxs/clevelandclinic/AbuDhabi/jobs"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json'
-        }
-
-        payload = {
-            "appliedFacets": {},
-            "limit": 20,
-            "offset": 0,
-            "searchText": "nurse"
-        }
-
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
-
-        jobs = []
-        if response.status_code == 200:
-            data = response.json()
-            job_postings = data.get('jobPostings', [])
-
-            for job in job_postings:
-                title_obj = job.get('title', '')
-                title = title_obj if isinstance(title_obj, str) else ''
-
-                jobs.append({
-                    'Job Title': title,
-                    'Platform': 'Cleveland Clinic',
-                    'Company Name': 'Cleveland Clinic Abu Dhabi',
-                    'Description': '',
-                    'Location': job.get('locationsText', 'Abu Dhabi'),
-                    'Work Model': '',
-                    'Published': now_iso().split('T')[0],
-                    'Salary': '',
-                    'Seniority': '',
-                    'Company Size': '',
-                    'Industry': 'Healthcare',
-                    'Apply Link': f"https://clevelandclinic.wd5.myworkdayjobs.com/AbuDhabi{job.get('externalPath', '')}",
-                    'Source': 'Cleveland Clinic (Direct)',
-                    'Collected At': now_iso(),
-                    '_uid': ''
-                })
-
-        print(f"Found {len(jobs)} nursing jobs from Cleveland Clinic")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping Cleveland Clinic: {e}")
-        return []
-
-def scrape_aster_dm():
-    """Scrape Aster DM Healthcare"""
-    print("\n[Hospital 6/15] Scraping Aster DM Healthcare...")
-    try:
-        url = "https://www.asterdmhealthcare.com/careers"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-
-        if response.status_code != 200:
-            print("Could not access Aster careers page")
-            return []
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        jobs = []
-
-        job_elements = soup.find_all(['div', 'article', 'li'], class_=re.compile(r'job|career|vacancy', re.I))
+def open_sheet(read_rows):
+    """Authorize and open the sheet; read its rows only if asked (to seed an empty job store)"""
+    scopes = ['https://spreadsheets.google.com/feeds',
+              'https://www.googleapis.com/auth/drive']
+    creds = Credentials.from_service_account_file(CREDS_PATH, scopes=scopes)
+    client = gspread.authorize(creds)
+    sheet = client.open_by_key(SHEET_ID)
+    worksheet = sheet.get_worksheet(0)
+    return sheet, worksheet, worksheet.get_all_values() if read_rows else None
 
-        for job_elem in job_elements[:20]:
-            title_elem = job_elem.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name', re.I))
-            if not title_elem:
-                continue
+# The local job store is the system of record; the sheet is only read back when the store is empty
+job_store = JobStore()
+sheet_reader = ThreadPoolExecutor(max_workers=1)
+sheet_future = sheet_reader.submit(open_sheet, len(job_store) == 0)  # Errors surface at .result() in the sheet step
 
-            title = title_elem.get_text(strip=True)
-
-            if any(keyword in title.lower() for keyword in ['nurse', 'nursing', 'rn']):
-                link_elem = job_elem.find('a', href=True) or title_elem if title_elem.name == 'a' else None
-                apply_link = link_elem.get('href', url) if link_elem else url
-
-                if not apply_link.startswith('http'):
-                    apply_link = 'https://www.asterdmhealthcare.com' + apply_link
-
-                jobs.append({
-                    'Job Title': title,
-                    'Platform': 'Aster DM Healthcare',
-                    'Company Name': 'Aster DM Healthcare',
-                    'Description': '',
-                    'Location': 'UAE',
-                    'Work Model': '',
-                    'Published': now_iso().split('T')[0],
-                    'Salary': '',
-                    'Seniority': '',
-                    'Company Size': '',
-                    'Industry': 'Healthcare',
-                    'Apply Link': apply_link,
-                    'Source': 'Aster DM (Direct)',
-                    'Collected At': now_iso(),
-                    '_uid': ''
-                })
-
-        print(f"Found {len(jobs)} nursing jobs from Aster")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping Aster: {e}")
-        return []
-
-def scrape_saudi_german():
-    """Scrape Saudi German Hospital"""
-    print("\n[Hospital 7/15] Scraping Saudi German Hospital...")
-    try:
-        url = "https://www.sghgroup.ae/careers"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-
-        jobs = []
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_elements = soup.find_all(['div', 'article', 'li'], class_=re.compile(r'job|career|position', re.I))
-
-            for job_elem in job_elements[:20]:
-                title_elem = job_elem.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name', re.I))
-                if not title_elem:
-                    continue
-
-                title = title_elem.get_text(strip=True)
-                if any(keyword in title.lower() for keyword in ['nurse', 'nursing', 'rn']):
-                    link_elem = job_elem.find('a', href=True) or title_elem if title_elem.name == 'a' else None
-                    apply_link = link_elem.get('href', url) if link_elem else url
-
-                    if not apply_link.startswith('http'):
-                        apply_link = 'https://www.sghgroup.ae' + apply_link
-
-                    jobs.append({
-                        'Job Title': title,
-                        'Platform': 'Saudi German Hospital',
-                        'Company Name': 'Saudi German Hospital',
-                        'Description': '',
-                        'Location': 'UAE',
-                        'Work Model': '',
-                        'Published': now_iso().split('T')[0],
-                        'Salary': '',
-                        'Seniority': '',
-                        'Company Size': '',
-                        'Industry': 'Healthcare',
-                        'Apply Link': apply_link,
-                        'Source': 'Saudi German (Direct)',
-                        'Collected At': now_iso(),
-                        '_uid': ''
-                    })
-
-        print(f"Found {len(jobs)} nursing jobs from Saudi German")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping Saudi German: {e}")
-        return []
-
-def scrape_thumbay():
-    """Scrape Thumbay Group"""
-    print("\n[Hospital 8/15] Scraping Thumbay Group...")
-    jobs = scrape_greenhouse_jobs(
-        "https://boards-api.greenhouse.io/v1/boards/thumbaygroup/jobs",
-        "Thumbay Group",
-        location_filter="UAE"
-    )
-    print(f"Found {len(jobs)} nursing jobs from Thumbay")
-    return jobs
-
-def scrape_american_hospital_dubai():
-    """Scrape American Hospital Dubai"""
-    print("\n[Hospital 9/15] Scraping American Hospital Dubai...")
-    try:
-        url = "https://www.ahdubai.com/careers"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-
-        jobs = []
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_elements = soup.find_all(['div', 'article', 'li'], class_=re.compile(r'job|career', re.I))
-
-            for job_elem in job_elements[:20]:
-                title_elem = job_elem.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name', re.I))
-                if not title_elem:
-                    continue
-
-                title = title_elem.get_text(strip=True)
-                if any(keyword in title.lower() for keyword in ['nurse', 'nursing', 'rn']):
-                    link_elem = job_elem.find('a', href=True) or title_elem if title_elem.name == 'a' else None
-                    apply_link = link_elem.get('href', url) if link_elem else url
-
-                    if not apply_link.startswith('http'):
-                        apply_link = 'https://www.ahdubai.com' + apply_link
-
-                    jobs.append({
-                        'Job Title': title,
-                        'Platform': 'American Hospital Dubai',
-                        'Company Name': 'American Hospital Dubai',
-                        'Description': '',
-                        'Location': 'Dubai',
-                        'Work Model': '',
-                        'Published': now_iso().split('T')[0],
-                        'Salary': '',
-                        'Seniority': '',
-                        'Company Size': '',
-                        'Industry': 'Healthcare',
-                        'Apply Link': apply_link,
-                        'Source': 'American Hospital (Direct)',
-                        'Collected At': now_iso(),
-                        '_uid': ''
-                    })
-
-        print(f"Found {len(jobs)} nursing jobs from American Hospital")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping American Hospital: {e}")
-        return []
-
-def scrape_al_zahra():
-    """Scrape Al Zahra Hospital"""
-    print("\n[Hospital 10/15] Scraping Al Zahra Hospital...")
-    try:
-        url = "https://www.alzahra.com/careers"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-
-        jobs = []
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_elements = soup.find_all(['div', 'article', 'li'], class_=re.compile(r'job|career', re.I))
-
-            for job_elem in job_elements[:20]:
-                title_elem = job_elem.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name', re.I))
-                if not title_elem:
-                    continue
-
-                title = title_elem.get_text(strip=True)
-                if any(keyword in title.lower() for keyword in ['nurse', 'nursing', 'rn']):
-                    link_elem = job_elem.find('a', href=True) or title_elem if title_elem.name == 'a' else None
-                    apply_link = link_elem.get('href', url) if link_elem else url
-
-                    if not apply_link.startswith('http'):
-                        apply_link = 'https://www.alzahra.com' + apply_link
-
-                    jobs.append({
-                        'Job Title': title,
-                        'Platform': 'Al Zahra Hospital',
-                        'Company Name': 'Al Zahra Hospital',
-                        'Description': '',
-                        'Location': 'Dubai',
-                        'Work Model': '',
-                        'Published': now_iso().split('T')[0],
-                        'Salary': '',
-                        'Seniority': '',
-                        'Company Size': '',
-                        'Industry': 'Healthcare',
-                        'Apply Link': apply_link,
-                        'Source': 'Al Zahra (Direct)',
-                        'Collected At': now_iso(),
-                        '_uid': ''
-                    })
-
-        print(f"Found {len(jobs)} nursing jobs from Al Zahra")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping Al Zahra: {e}")
-        return []
-
-def scrape_zulekha():
-    """Scrape Zulekha Hospital"""
-    print("\n[Hospital 11/15] Scraping Zulekha Hospital...")
-    try:
-        url = "https://www.zulekhahospitals.com/careers"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-
-        jobs = []
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_elements = soup.find_all(['div', 'article', 'li'], class_=re.compile(r'job|career', re.I))
-
-            for job_elem in job_elements[:20]:
-                title_elem = job_elem.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name', re.I))
-                if not title_elem:
-                    continue
-
-                title = title_elem.get_text(strip=True)
-                if any(keyword in title.lower() for keyword in ['nurse', 'nursing', 'rn']):
-                    link_elem = job_elem.find('a', href=True) or title_elem if title_elem.name == 'a' else None
-                    apply_link = link_elem.get('href', url) if link_elem else url
-
-                    if not apply_link.startswith('http'):
-                        apply_link = 'https://www.zulekhahospitals.com' + apply_link
-
-                    jobs.append({
-                        'Job Title': title,
-                        'Platform': 'Zulekha Hospital',
-                        'Company Name': 'Zulekha Hospital',
-                        'Description': '',
-                        'Location': 'UAE',
-                        'Work Model': '',
-                        'Published': now_iso().split('T')[0],
-                        'Salary': '',
-                        'Seniority': '',
-                        'Company Size': '',
-                        'Industry': 'Healthcare',
-                        'Apply Link': apply_link,
-                        'Source': 'Zulekha (Direct)',
-                        'Collected At': now_iso(),
-                        '_uid': ''
-                    })
-
-        print(f"Found {len(jobs)} nursing jobs from Zulekha")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping Zulekha: {e}")
-        return []
-
-def scrape_fakeeh():
-    """Scrape Dr. Sulaiman Al Habib (Fakeeh)"""
-    print("\n[Hospital 12/15] Scraping Dr. Sulaiman Al Habib...")
-    try:
-        url = "https://www.drsulaimanalhabib.com/careers"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-
-        jobs = []
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_elements = soup.find_all(['div', 'article', 'li'], class_=re.compile(r'job|career', re.I))
-
-            for job_elem in job_elements[:20]:
-                title_elem = job_elem.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name', re.I))
-                if not title_elem:
-                    continue
-
-                title = title_elem.get_text(strip=True)
-                if any(keyword in title.lower() for keyword in ['nurse', 'nursing', 'rn']):
-                    link_elem = job_elem.find('a', href=True) or title_elem if title_elem.name == 'a' else None
-                    apply_link = link_elem.get('href', url) if link_elem else url
-
-                    if not apply_link.startswith('http'):
-                        apply_link = 'https://www.drsulaimanalhabib.com' + apply_link
-
-                    jobs.append({
-                        'Job Title': title,
-                        'Platform': 'Dr. Sulaiman Al Habib',
-                        'Company Name': 'Dr. Sulaiman Al Habib',
-                        'Description': '',
-                        'Location': 'UAE',
-                        'Work Model': '',
-                        'Published': now_iso().split('T')[0],
-                        'Salary': '',
-                        'Seniority': '',
-                        'Company Size': '',
-                        'Industry': 'Healthcare',
-                        'Apply Link': apply_link,
-                        'Source': 'Dr. Sulaiman Al Habib (Direct)',
-                        'Collected At': now_iso(),
-                        '_uid': ''
-                    })
-
-        print(f"Found {len(jobs)} nursing jobs from Dr. Sulaiman Al Habib")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping Dr. Sulaiman Al Habib: {e}")
-        return []
-
-def scrape_emirates_hospital():
-    """Scrape Emirates Hospital"""
-    print("\n[Hospital 13/15] Scraping Emirates Hospital...")
-    try:
-        url = "https://www.emirateshospital.ae/careers"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-
-        jobs = []
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_elements = soup.find_all(['div', 'article', 'li'], class_=re.compile(r'job|career', re.I))
-
-            for job_elem in job_elements[:20]:
-                title_elem = job_elem.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name', re.I))
-                if not title_elem:
-                    continue
-
-                title = title_elem.get_text(strip=True)
-                if any(keyword in title.lower() for keyword in ['nurse', 'nursing', 'rn']):
-                    link_elem = job_elem.find('a', href=True) or title_elem if title_elem.name == 'a' else None
-                    apply_link = link_elem.get('href', url) if link_elem else url
-
-                    if not apply_link.startswith('http'):
-                        apply_link = 'https://www.emirateshospital.ae' + apply_link
-
-                    jobs.append({
-                        'Job Title': title,
-                        'Platform': 'Emirates Hospital',
-                        'Company Name': 'Emirates Hospital',
-                        'Description': '',
-                        'Location': 'UAE',
-                        'Work Model': '',
-                        'Published': now_iso().split('T')[0],
-                        'Salary': '',
-                        'Seniority': '',
-                        'Company Size': '',
-                        'Industry': 'Healthcare',
-                        'Apply Link': apply_link,
-                        'Source': 'Emirates Hospital (Direct)',
-                        'Collected At': now_iso(),
-                        '_uid': ''
-                    })
-
-        print(f"Found {len(jobs)} nursing jobs from Emirates Hospital")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping Emirates Hospital: {e}")
-        return []
-
-def scrape_rak_hospital():
-    """Scrape RAK Hospital"""
-    print("\n[Hospital 14/15] Scraping RAK Hospital...")
-    try:
-        url = "https://www.rakhospital.com/careers"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-
-        jobs = []
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_elements = soup.find_all(['div', 'article', 'li'], class_=re.compile(r'job|career', re.I))
-
-            for job_elem in job_elements[:20]:
-                title_elem = job_elem.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name', re.I))
-                if not title_elem:
-                    continue
-
-                title = title_elem.get_text(strip=True)
-                if any(keyword in title.lower() for keyword in ['nurse', 'nursing', 'rn']):
-                    link_elem = job_elem.find('a', href=True) or title_elem if title_elem.name == 'a' else None
-                    apply_link = link_elem.get('href', url) if link_elem else url
-
-                    if not apply_link.startswith('http'):
-                        apply_link = 'https://www.rakhospital.com' + apply_link
-
-                    jobs.append({
-                        'Job Title': title,
-                        'Platform': 'RAK Hospital',
-                        'Company Name': 'RAK Hospital',
-                        'Description': '',
-                        'Location': 'Ras Al Khaimah',
-                        'Work Model': '',
-                        'Published': now_iso().split('T')[0],
-                        'Salary': '',
-                        'Seniority': '',
-                        'Company Size': '',
-                        'Industry': 'Healthcare',
-                        'Apply Link': apply_link,
-                        'Source': 'RAK Hospital (Direct)',
-                        'Collected At': now_iso(),
-                        '_uid': ''
-                    })
-
-        print(f"Found {len(jobs)} nursing jobs from RAK Hospital")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping RAK Hospital: {e}")
-        return []
-
-def scrape_healthpoint():
-    """Scrape Healthpoint Hospital"""
-    print("\n[Hospital 15/15] Scraping Healthpoint Hospital...")
-    try:
-        url = "https://www.healthpointhospital.com/careers"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-
-        jobs = []
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_elements = soup.find_all(['div', 'article', 'li'], class_=re.compile(r'job|career', re.I))
-
-            for job_elem in job_elements[:20]:
-                title_elem = job_elem.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name', re.I))
-                if not title_elem:
-                    continue
-
-                title = title_elem.get_text(strip=True)
-                if any(keyword in title.lower() for keyword in ['nurse', 'nursing', 'rn']):
-                    link_elem = job_elem.find('a', href=True) or title_elem if title_elem.name == 'a' else None
-                    apply_link = link_elem.get('href', url) if link_elem else url
-
-                    if not apply_link.startswith('http'):
-                        apply_link = 'https://www.healthpointhospital.com' + apply_link
-
-                    jobs.append({
-                        'Job Title': title,
-                        'Platform': 'Healthpoint Hospital',
-                        'Company Name': 'Healthpoint Hospital',
-                        'Description': '',
-                        'Location': 'Abu Dhabi',
-                        'Work Model': '',
-                        'Published': now_iso().split('T')[0],
-                        'Salary': '',
-                        'Seniority': '',
-                        'Company Size': '',
-                        'Industry': 'Healthcare',
-                        'Apply Link': apply_link,
-                        'Source': 'Healthpoint (Direct)',
-                        'Collected At': now_iso(),
-                        '_uid': ''
-                    })
-
-        print(f"Found {len(jobs)} nursing jobs from Healthpoint")
-        return jobs
-    except Exception as e:
-        print(f"Error scraping Healthpoint: {e}")
-        return []
+# ============================================================================
+# STREAMING PIPELINE - fetch -> normalise -> filter -> dedup -> sink
+# ============================================================================
+# Every search and hospital source is pushed through the stages as soon as it
+# returns, so processing overlaps with the scrapers still running
+
+RUN_COLLECTED_AT = now_iso()  # One timestamp for every row of this run
+nursing_counts = {"scraped": 0, "kept": 0}
+seen_uids = set()
+seen_keys = JobKeyIndex()
+stream_frames = []
+
+def normalise_stage(item):
+    kind, payload = item
+    if kind == "jobspy":
+        if payload.empty:
+            return None
+        # Everything scraped counts as handled once the sheet is updated, filtered out or not
+        known_jobs.remember(jobspy_uids(payload))
+        return kind, normalise_jobs(payload, source_label="JobSpy", collected_at=RUN_COLLECTED_AT)
+    if not payload["jobs"]:
+        return None
+    df = records_frame(payload["jobs"])
+    df['_uid'] = uids_for(df)
+    return kind, df
+
+def filter_stage(item):
+    kind, df = item
+    # Keep nursing roles only (word-boundary title match); hospital parsers filter their own
+    if kind == "jobspy" and NURSING_FILTER:
+        mask = NURSING.mask(df['Job Title'])
+        nursing_counts["scraped"] += len(df)
+        nursing_counts["kept"] += int(mask.sum())
+        df = df[mask]
+    return (kind, df) if not df.empty else None
+
+def dedup_stage(item):
+    kind, df = item
+    # One row per UID and per platform job ID across everything streamed so far
+    df = df.drop_duplicates(subset=['_uid'], keep='first')
+    df = df[~df['_uid'].isin(seen_uids)]
+    df = df[seen_keys.first_mask(df['Apply Link'])]
+    seen_uids.update(df['_uid'])
+    return (kind, df) if not df.empty else None
+
+def sink_stage(item):
+    stream_frames.append(item)
+    return None
+
+pipeline = Pipeline([
+    Stage("normalise", normalise_stage),
+    Stage("filter", filter_stage),
+    Stage("dedup", dedup_stage),
+    Stage("sink", sink_stage),
+]).start()
 
 # ============================================================================
 # JOBSPY SCRAPING
 # ============================================================================
 
-log_status("Starting JobSpy scraping (8 searches)", "INFO")
-all_jobs = []
-total_before_dedup = 0
-
-# Search 1: General nursing jobs in Dubai
-print(f"\n[1/7] Searching for nursing jobs in Dubai (Last 30 days - {HOURS_OLD} hours)...")
-log_status("JobSpy Search 1/7: Dubai nursing jobs", "INFO")
-jobs1 = scrape_jobs(
-    site_name=ALL_PLATFORMS,
-    search_term="nurse nursing registered nurse",
-    location="Dubai",
-    results_wanted=150,
-    hours_old=HOURS_OLD,
-    country_indeed='United Arab Emirates'
-)
-all_jobs.append(jobs1)
-total_before_dedup += len(jobs1)
-print(f"Found {len(jobs1)} jobs")
-
-# Search 2: DHA licensed nursing jobs - WORLDWIDE
-print(f"\n[2/7] Searching for DHA licensed nursing jobs WORLDWIDE (Last 30 days - {HOURS_OLD} hours)...")
-jobs2 = scrape_jobs(
-    site_name=ALL_PLATFORMS,
-    search_term="DHA licensed nurse Dubai Health Authority",
-    location="",
-    results_wanted=150,
-    hours_old=HOURS_OLD
-)
-all_jobs.append(jobs2)
-total_before_dedup += len(jobs2)
-print(f"Found {len(jobs2)} jobs")
-
-# Search 3: Abu Dhabi and Sharjah nursing jobs
-print(f"\n[3/7] Searching for nursing jobs in Abu Dhabi and Sharjah (Last 30 days - {HOURS_OLD} hours)...")
-jobs3 = scrape_jobs(
-    site_name=ALL_PLATFORMS,
-    search_term="nurse nursing healthcare",
-    location="Abu Dhabi",
-    results_wanted=150,
-    hours_old=HOURS_OLD,
-    country_indeed='United Arab Emirates'
-)
-all_jobs.append(jobs3)
-total_before_dedup += len(jobs3)
-print(f"Found {len(jobs3)} jobs")
-
-# Search 4: Staff and clinical nurse positions
-print(f"\n[4/7] Searching for staff nurse and clinical positions (Last 30 days - {HOURS_OLD} hours)...")
-jobs4 = scrape_jobs(
-    site_name=ALL_PLATFORMS,
-    search_term="staff nurse clinical nurse RN",
-    location="Dubai",
-    results_wanted=150,
-    hours_old=HOURS_OLD,
-    country_indeed='United Arab Emirates'
-)
-all_jobs.append(jobs4)
-total_before_dedup += len(jobs4)
-print(f"Found {len(jobs4)} jobs")
-
-# Search 5: Major hospital groups
-print(f"\n[5/7] Searching major hospitals: NMC, Mediclinic, Fakeeh (Last 30 days - {HOURS_OLD} hours)...")
-jobs5 = scrape_jobs(
-    site_name=ALL_PLATFORMS,
-    search_term="nurse NMC Mediclinic Fakeeh hospital",
-    location="Dubai",
-    results_wanted=150,
-    hours_old=HOURS_OLD,
-    country_indeed='United Arab Emirates'
-)
-all_jobs.append(jobs5)
-total_before_dedup += len(jobs5)
-print(f"Found {len(jobs5)} jobs")
-
-# Search 6: Sheikh Shakhbout, Cleveland Clinic, Burjeel hospitals
-print(f"\n[6/7] Searching hospitals: Sheikh Shakhbout, Cleveland Clinic, Burjeel (Last 30 days - {HOURS_OLD} hours)...")
-jobs6 = scrape_jobs(
-    site_name=ALL_PLATFORMS,
-    search_term="nurse Sheikh Shakhbout Cleveland Clinic Burjeel",
-    location="Abu Dhabi",
-    results_wanted=150,
-    hours_old=HOURS_OLD,
-    country_indeed='United Arab Emirates'
-)
-all_jobs.append(jobs6)
-total_before_dedup += len(jobs6)
-print(f"Found {len(jobs6)} jobs")
-
-# Search 7: More hospitals
-print(f"\n[7/7] Searching hospitals: Saudi German, Aster, Al Zahra (Last 30 days - {HOURS_OLD} hours)...")
-jobs7 = scrape_jobs(
-    site_name=ALL_PLATFORMS,
-    search_term="nurse Saudi German Aster Al Zahra hospital",
-    location="Dubai",
-    results_wanted=150,
-    hours_old=HOURS_OLD,
-    country_indeed='United Arab Emirates'
-)
-all_jobs.append(jobs7)
-total_before_dedup += len(jobs7)
-print(f"Found {len(jobs7)} jobs")
-
-# Search 8: Bayt, GulfTalent, Naukrigulf, Monster Gulf
-print(f"\n[8/8] Searching UAE job portals (Bayt/GulfTalent) (Last 30 days - {HOURS_OLD} hours)...")
-log_status("JobSpy Search 8/8: UAE job portals", "INFO")
-jobs8 = scrape_jobs(
-    site_name=ALL_PLATFORMS,
-    search_term="nurse registered nurse DHA MOH",
-    location="United Arab Emirates",
-    results_wanted=200,
-    hours_old=HOURS_OLD,
-    country_indeed='United Arab Emirates'
-)
-all_jobs.append(jobs8)
-total_before_dedup += len(jobs8)
-print(f"Found {len(jobs8)} jobs")
+# One wall-clock budget for the scraping stages, with time kept back for the sheet;
+# the sources that brought the most new jobs per second run first
+run_budget = RunBudget()
+source_yield = YieldHistory()
+
+log_status("Starting JobSpy scraping (8 searches, concurrent)", "INFO")
+
+SEARCHES = [
+    # Search 1: General nursing jobs in Dubai
+    {"label": "Dubai nursing jobs", "search_term": "nurse nursing registered nurse",
+     "location": "Dubai", "results_wanted": 150, "country_indeed": 'United Arab Emirates'},
+    # Search 2: DHA licensed nursing jobs - WORLDWIDE
+    {"label": "DHA licensed nursing jobs WORLDWIDE", "search_term": "DHA licensed nurse Dubai Health Authority",
+     "location": "", "results_wanted": 150},
+    # Search 3: Abu Dhabi and Sharjah nursing jobs
+    {"label": "Abu Dhabi and Sharjah nursing jobs", "search_term": "nurse nursing healthcare",
+     "location": "Abu Dhabi", "results_wanted": 150, "country_indeed": 'United Arab Emirates'},
+    # Search 4: Staff and clinical nurse positions
+    {"label": "Staff nurse and clinical positions", "search_term": "staff nurse clinical nurse RN",
+     "location": "Dubai", "results_wanted": 150, "country_indeed": 'United Arab Emirates'},
+    # Search 5: Major hospital groups
+    {"label": "Major hospitals: NMC, Mediclinic, Fakeeh", "search_term": "nurse NMC Mediclinic Fakeeh hospital",
+     "location": "Dubai", "results_wanted": 150, "country_indeed": 'United Arab Emirates'},
+    # Search 6: Sheikh Shakhbout, Cleveland Clinic, Burjeel hospitals
+    {"label": "Hospitals: Sheikh Shakhbout, Cleveland Clinic, Burjeel", "search_term": "nurse Sheikh Shakhbout Cleveland Clinic Burjeel",
+     "location": "Abu Dhabi", "results_wanted": 150, "country_indeed": 'United Arab Emirates'},
+    # Search 7: More hospitals
+    {"label": "Hospitals: Saudi German, Aster, Al Zahra", "search_term": "nurse Saudi German Aster Al Zahra hospital",
+     "location": "Dubai", "results_wanted": 150, "country_indeed": 'United Arab Emirates'},
+    # Search 8: Bayt, GulfTalent, Naukrigulf, Monster Gulf
+    {"label": "UAE job portals (Bayt/GulfTalent)", "search_term": "nurse registered nurse DHA MOH",
+     "location": "United Arab Emirates", "results_wanted": 200, "country_indeed": 'United Arab Emirates'},
+]
+
+# Each search only looks back to its last successful run (max HOURS_OLD)
+search_watermarks = SearchWatermarks("agent", HOURS_OLD)
+# ...and stops paging once a whole page is postings earlier runs already handled
+known_jobs = KnownJobs("agent")
+
+print(f"\nRunning {len(SEARCHES)} searches on {', '.join(ALL_PLATFORMS)} (up to last {HOURS_OLD} hours)...")
+all_jobs, search_report = run_searches(SEARCHES, ALL_PLATFORMS, HOURS_OLD, watermarks=search_watermarks,
+                                       known=known_jobs, budget=run_budget, yields=source_yield,
+                                       on_result=lambda search, df: pipeline.put(("jobspy", df)))
+print_search_report(search_report)
+
+total_before_dedup = sum(entry["results"] for entry in search_report)
+for entry in search_report:
+    if entry["errors"]:
+        run_status["errors"].extend(f"JobSpy '{entry['label']}' - {error}" for error in entry["errors"])
+    elif not entry["deferred"]:
+        run_status["jobspy_searches_completed"] += 1
+log_status(f"JobSpy searches completed: {run_status['jobspy_searches_completed']}/{len(SEARCHES)} "
+           f"({total_before_dedup} jobs before dedup)", "SUCCESS")
 
 # ============================================================================
 # HOSPITAL DIRECT SCRAPING
 # ============================================================================
 
 print("\n" + "="*80)
-print("Scraping jobs directly from hospital websites...")
+print(f"Scraping jobs directly from {len(HOSPITAL_SOURCES)} hospital websites (concurrent)...")
 print("="*80)
 
-hospital_jobs = []
-
-# Scrape each hospital
-try:
-    hospital_jobs.extend(scrape_nmc_healthcare())
-except Exception as e:
-    print(f"NMC scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_kings_college())
-except Exception as e:
-    print(f"Kings College scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_burjeel_holdings())
-except Exception as e:
-    print(f"Burjeel scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_mediclinic())
-except Exception as e:
-    print(f"Mediclinic scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_cleveland_clinic())
-except Exception as e:
-    print(f"Cleveland Clinic scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_aster_dm())
-except Exception as e:
-    print(f"Aster scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_saudi_german())
-except Exception as e:
-    print(f"Saudi German scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_thumbay())
-except Exception as e:
-    print(f"Thumbay scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_american_hospital_dubai())
-except Exception as e:
-    print(f"American Hospital scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_al_zahra())
-except Exception as e:
-    print(f"Al Zahra scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_zulekha())
-except Exception as e:
-    print(f"Zulekha scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_fakeeh())
-except Exception as e:
-    print(f"Dr. Sulaiman Al Habib scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_emirates_hospital())
-except Exception as e:
-    print(f"Emirates Hospital scraping failed: {e}")
-
-try:
-    hospital_jobs.extend(scrape_rak_hospital())
-except Exception as e:
-    print(f"RAK Hospital scraping failed: {e}")
-
+response_cache = ResponseCache()
+source_health = SourceHealth() if SOURCE_BREAKER else None
+hospital_sources = []
+for source in HOSPITAL_SOURCES:
+    expected = source_yield.expected_seconds("hospital|" + source["name"])
+    if run_budget.fits(expected):
+        hospital_sources.append(source)
+    else:
+        run_budget.defer(source["name"], f"needs ~{expected:.0f}s, {run_budget.remaining():.0f}s left")
+hospital_jobs, hospital_report = run_hospital_sources(hospital_sources, cache=response_cache, restamp=restamp_jobs,
+                                                      health=source_health,
+                                                      deadline=min(HOSPITAL_DEADLINE, run_budget.remaining()),
+                                                      on_result=lambda entry: pipeline.put(("hospital", entry)))
+print_hospital_report(hospital_report)
+print_connection_stats()
+get_scheduler().print_stats()  # JobSpy searches + hospital fetches
 try:
-    hospital_jobs.extend(scrape_healthpoint())
-except Exception as e:
-    print(f"Healthpoint scraping failed: {e}")
+    response_cache.save()
+    response_cache.print_stats()
+    if source_health is not None:
+        source_health.save()
+        source_health.print_report([source["name"] for source in HOSPITAL_SOURCES])
+except OSError as e:
+    print(f"Could not save hospital state: {e}")
+
+for entry in hospital_report:
+    if entry["status"] in ("ok", "unchanged"):
+        run_status["hospital_scrapers_completed"] += 1
+    elif entry["status"] != "skipped":
+        run_status["errors"].append(f"Hospital '{entry['name']}' - {entry['error']}")
 
 print(f"\nTotal hospital jobs found: {len(hospital_jobs)}")
+run_budget.print_report()
 
 # ============================================================================
 # PROCESSING NEW JOBS (JobSpy + Hospital Direct)
@@ -1007,161 +280,93 @@ print(f"\nTotal hospital jobs found: {len(hospital_jobs)}")
 print("\n" + "="*80)
 print("Processing new jobs...")
 
-# Process JobSpy results
-jobs = pd.concat(all_jobs, ignore_index=True)
-jobs = jobs.drop_duplicates(subset=['job_url'], keep='first')
-
-# Convert date_posted to datetime first
-jobs['date_posted'] = pd.to_datetime(jobs['date_posted'], errors='coerce')
-
-# Prepare JobSpy jobs in required format
-jobspy_df = pd.DataFrame({
-    'Job Title': jobs['title'],
-    'Platform': jobs['site'].str.capitalize(),  # Platform column added
-    'Company Name': jobs['company'],
-    'Description': jobs['description'].str[:500],  # First 500 chars
-    'Location': jobs['location'],
-    'Work Model': '',  # Empty for now
-    'Published': jobs['date_posted'].dt.strftime('%Y-%m-%d'),
-    'Salary': jobs.apply(lambda x: f"${x['min_amount']}-${x['max_amount']}"
-                         if pd.notna(x.get('min_amount')) and pd.notna(x.get('max_amount'))
-                         else '', axis=1),
-    'Seniority': '',  # Empty for now
-    'Company Size': '',  # Empty for now
-    'Industry': 'Healthcare',
-    'Apply Link': jobs['job_url'],
-    'Source': jobs['site'].str.capitalize() + ' (JobSpy)',
-    'Collected At': now_iso(),
-    '_uid': ''  # Will be calculated
-})
-
-# Add unique ID for JobSpy jobs
-jobspy_df['_uid'] = jobspy_df.apply(uid_for, axis=1)
-
-# Convert hospital jobs to DataFrame
-if hospital_jobs:
-    hospital_df = pd.DataFrame(hospital_jobs)
-    # Add unique ID for hospital jobs
-    hospital_df['_uid'] = hospital_df.apply(uid_for, axis=1)
+# Let the last items drain through the stages
+pipeline.close()
+print_pipeline_report(pipeline)
+if NURSING_FILTER:
+    print(f"Nursing filter: kept {nursing_counts['kept']} of {nursing_counts['scraped']} JobSpy jobs")
+
+# JobSpy rows first, then hospital rows (the order the sheet has always had)
+jobspy_rows = sum(len(df) for kind, df in stream_frames if kind == "jobspy")
+hospital_rows = sum(len(df) for kind, df in stream_frames if kind == "hospital")
+stream_frames.sort(key=lambda item: item[0] != "jobspy")
+if stream_frames:
+    new_jobs_df = pd.concat([df for _, df in stream_frames], ignore_index=True)
 else:
-    hospital_df = pd.DataFrame()
-
-# Combine JobSpy + Hospital jobs
-if not hospital_df.empty:
-    new_jobs_df = pd.concat([jobspy_df, hospital_df], ignore_index=True)
-    new_jobs_df = new_jobs_df.drop_duplicates(subset=['_uid'], keep='first')
-    print(f"JobSpy jobs: {len(jobspy_df)}")
-    print(f"Hospital jobs: {len(hospital_df)}")
-    print(f"Total after dedup: {len(new_jobs_df)}")
-else:
-    new_jobs_df = jobspy_df
-    print(f"Total jobs scraped: {len(new_jobs_df)} (JobSpy only)")
+    new_jobs_df = pd.DataFrame(columns=list(COLUMNS))
+print(f"JobSpy jobs: {jobspy_rows}")
+print(f"Hospital jobs: {hospital_rows}")
+print(f"Total after dedup: {len(new_jobs_df)}")
+
+# Same posting on LinkedIn, Indeed and the hospital's site -> one row with the other links
+if NEAR_DUP_SIMILARITY > 0:
+    new_jobs_df, duplicate_report = collapse_near_duplicates(new_jobs_df, similarity=NEAR_DUP_SIMILARITY)
+    print_duplicate_report(duplicate_report)
+
+# Compact dtypes end here - the sheet takes plain text values
+new_jobs_df = sheet_frame(new_jobs_df)
 
 # ============================================================================
 # GOOGLE SHEETS - MERGE WITH EXISTING DATA
 # ============================================================================
 
 print("\n" + "="*80)
-print("Connecting to Google Sheets...")
+print("Google Sheets (connected in the background)...")
 
 try:
-    scopes = ['https://spreadsheets.google.com/feeds',
-              'https://www.googleapis.com/auth/drive']
-    creds = Credentials.from_service_account_file(CREDS_PATH, scopes=scopes)
-    client = gspread.authorize(creds)
-    sheet = client.open_by_key(SHEET_ID)
-    worksheet = sheet.get_worksheet(0)
+    # Connected and read while the scrapers ran (see open_sheet above)
+    sheet, worksheet, existing_data = sheet_future.result()
+    sheet_reader.shutdown()
 
     print(f"[OK] Connected to Google Sheet: {sheet.title}")
 
-    # ============================================================================
-    # READ EXISTING DATA FROM SHEET
-    # ============================================================================
-    print("Reading existing data from sheet...")
-
-    existing_data = worksheet.get_all_values()
-
-    if len(existing_data) > 1:  # Has header + data
-        existing_df = pd.DataFrame(existing_data[1:], columns=existing_data[0])
-
-        # Make sure _uid column exists in existing data
-        if '_uid' not in existing_df.columns:
-            existing_df = existing_df.reset_index(drop=True)
-            existing_df['_uid'] = existing_df.apply(uid_for, axis=1)
-
-        print(f"Existing jobs in sheet: {len(existing_df)}")
-
-        # ============================================================================
-        # DELETE OLD JOBS - Keep only current month (last 30 days)
-        # ============================================================================
-        print("Removing old/expired jobs (keeping only LAST 7 DAYS - fresh jobs only)...")
-
-        # Check if "Collected At" column exists
-        if 'Collected At' in existing_df.columns:
-            # Convert Collected At to datetime (timezone-aware)
-            existing_df['Collected At'] = pd.to_datetime(existing_df['Collected At'], errors='coerce')
-
-            # Calculate cutoff date (7 days ago) - make it timezone-aware
-            from datetime import datetime, timedelta, timezone as tz
-            cutoff_date = datetime.now(tz.utc) - timedelta(days=7)
-
-            # Ensure both are timezone-aware for comparison
-            if existing_df['Collected At'].dt.tz is None:
-                existing_df['Collected At'] = existing_df['Collected At'].dt.tz_localize('UTC')
-
-            # Keep only jobs from last 7 days (remove expired jobs) and RESET INDEX
-            existing_df = existing_df[existing_df['Collected At'] >= cutoff_date].reset_index(drop=True)
-
-            # Convert back to string
-            existing_df['Collected At'] = existing_df['Collected At'].astype(str)
-
-            print(f"✅ Jobs after cleanup (LAST 7 DAYS ONLY): {len(existing_df)}")
+    if existing_data is not None:
+        # Empty job store (first run or lost state) - seed it from the job rows the sheet holds
+        header = next((i for i, row in enumerate(existing_data) if row and row[0] == 'Job Title'), None)
+        if header is not None and '_uid' in existing_data[header]:
+            existing_df = pd.DataFrame(existing_data[header + 1:], columns=existing_data[header])
+            print(f"Seeded job store with {job_store.bootstrap(existing_df)} jobs from the sheet")
         else:
-            print("⚠️ 'Collected At' column not found - keeping all existing jobs")
-
-        # ============================================================================
-        # MERGE: Keep old + Add only NEW jobs
-        # ============================================================================
-        print("Merging with new jobs...")
+            print("No existing data - this is first run")
 
-        # Track existing UIDs to detect NEW jobs
-        existing_uids = set(existing_df['_uid'].values)
-        new_jobs_df['is_new'] = ~new_jobs_df['_uid'].isin(existing_uids)
-        new_jobs_count = new_jobs_df['is_new'].sum()
-
-        # Add 🔥 emoji to NEW job titles - using copy to avoid SettingWithCopyWarning
-        new_jobs_df = new_jobs_df.reset_index(drop=True).copy()
-        new_mask = new_jobs_df['is_new'].values
-        new_jobs_df.loc[new_mask, 'Job Title'] = '🔥 ' + new_jobs_df.loc[new_mask, 'Job Title'].astype(str)
-
-        # Combine old and new - reset indices before concat
-        existing_df = existing_df.reset_index(drop=True)
-        combined_df = pd.concat([existing_df, new_jobs_df], ignore_index=True)
-
-        # Remove duplicates (keep first occurrence = old jobs stay)
-        combined_df = combined_df.drop_duplicates(subset=['_uid'], keep='first').reset_index(drop=True)
-
-        # Sort by Collected At (newest first)
-        combined_df['Collected At'] = pd.to_datetime(combined_df['Collected At'], errors='coerce')
-        combined_df = combined_df.sort_values(by='Collected At', ascending=False, na_position='last').reset_index(drop=True)
-        # Convert back to string for Google Sheets
-        combined_df['Collected At'] = combined_df['Collected At'].astype(str)
-
-        print(f"🔥 NEW jobs added: {new_jobs_count}")
-        print(f"Total jobs now: {len(combined_df)}")
-
-    else:
-        # First run - no existing data
-        print("No existing data - this is first run")
+    # ============================================================================
+    # RETENTION - keep only the LAST 7 DAYS (indexed deletes in the job store)
+    # ============================================================================
+    print(f"Removed {job_store.prune()} old/expired jobs (keeping only LAST 7 DAYS - fresh jobs only)")
 
-        # Mark ALL jobs as new with 🔥 emoji
-        new_jobs_df['Job Title'] = '🔥 ' + new_jobs_df['Job Title'].astype(str)
+    # Remove jobs that were taken down from Greenhouse boards
+    removed_links = greenhouse.tombstone_links()
+    if removed_links:
+        print(f"Removed {job_store.remove_links(removed_links)} jobs no longer listed on Greenhouse boards")
 
-        combined_df = new_jobs_df
-        combined_df = combined_df.sort_values(by='Collected At', ascending=False).reset_index(drop=True)
-        new_jobs_count = len(combined_df)  # Set new_jobs_count for first run
-        print(f"🔥 NEW jobs added: {new_jobs_count}")
-        print(f"Total jobs: {len(combined_df)}")
+    # ============================================================================
+    # MERGE: Keep old + Add only NEW jobs (by UID and platform job ID)
+    # ============================================================================
+    print("Merging with new jobs...")
+    run_at = datetime.now(timezone.utc).timestamp()
+    new_jobs_df = job_store.merge(new_jobs_df, run_at)
+    new_jobs_count = int(new_jobs_df['is_new'].sum())
+
+    # The sheet is a projection of the store: every stored job, newest first; the jobs this
+    # run added are highlighted by a conditional-format rule on is_new (no 🔥 title rewrite)
+    combined_df = job_store.view(run_at)
+
+    print(f"🔥 NEW jobs added: {new_jobs_count}")
+    print(f"Total jobs now: {len(combined_df)}")
+
+    # Credit each source with the new jobs it brought, for next run's ordering
+    new_uids = set(new_jobs_df.loc[new_jobs_df['is_new'], '_uid']) if 'is_new' in new_jobs_df else set(new_jobs_df['_uid'])
+    for search, frame, entry in zip(SEARCHES, all_jobs, search_report):
+        for site, seconds in entry["site_seconds"].items():
+            if site in entry["deferred"]:
+                continue
+            rows = frame[frame['site'] == site] if not frame.empty else frame
+            new = int(jobspy_uids(rows).isin(new_uids).sum()) if not rows.empty else 0
+            source_yield.record(search_key(search, site), new, seconds)
+    for entry in hospital_report:
+        if entry["status"] != "skipped":
+            new = sum(uid_for(job.to_dict()) in new_uids for job in entry["jobs"])
+            source_yield.record("hospital|" + entry["name"], new, entry["seconds"])
 
     # ============================================================================
     # ADD DAILY SEPARATORS
@@ -1171,8 +376,10 @@ try:
     # Convert Collected At back to datetime for grouping
     combined_df['Collected At'] = pd.to_datetime(combined_df['Collected At'], errors='coerce')
 
-    # Sort by date (newest first) and RESET INDEX to avoid reindexing error
-    combined_df = combined_df.sort_values(by='Collected At', ascending=False, na_position='last').reset_index(drop=True)
+    # Sort by date (newest first) and RESET INDEX to avoid reindexing error; stable, so rows
+    # collected together keep the store's order and the sheet diff stays small
+    combined_df = combined_df.sort_values(by='Collected At', ascending=False, na_position='last',
+                                          kind='stable').reset_index(drop=True)
 
     # Convert back to string
     combined_df['Collected At'] = combined_df['Collected At'].astype(str)
@@ -1182,9 +389,6 @@ try:
     # ============================================================================
     print("\nUpdating Google Sheet...")
 
-    # Clear and update
-    worksheet.clear()
-
     # Replace NaN with empty string for Google Sheets
     combined_df = combined_df.fillna('')
 
@@ -1249,14 +453,20 @@ try:
     summary_rows.append(['GRAND TOTAL', str(len(combined_df)), '', ''])
     summary_rows.append(['', '', '', ''])
 
-    # Prepare data with summary table at top
-    data_to_upload = summary_rows + [[''], ['']]  # Add 2 blank rows after summary
+    # Every row carries its type in a hidden last column; the sheet's conditional-format
+    # rules colour summary, header, month and day rows from it
+    combined_df[ROW_TYPE_COLUMN] = 'job'
+    width = len(combined_df.columns)
+    summary_types = (['summary_title', 'summary_header'] + ['summary'] * (len(summary_rows) - 6)
+                     + ['summary_total'] * 3 + ['summary'])
+
+    # Prepare data with summary table at top, then 2 blank rows
+    data_to_upload = [row + [''] * (width - 1 - len(row)) + [row_type]
+                      for row, row_type in zip(summary_rows + [[''], ['']], summary_types + ['blank', 'blank'])]
     data_to_upload.append(combined_df.columns.values.tolist())  # Then column headers
 
     current_month = None
     current_date = None
-    date_separator_rows = []  # Track rows for date separators (blue)
-    month_separator_rows = []  # Track rows for month headers (green)
 
     # Reset index again before iteration to avoid duplicate index errors
     combined_df = combined_df.reset_index(drop=True)
@@ -1275,9 +485,8 @@ try:
             if current_month != month_key:
                 current_month = month_key
                 month_label = f"═══════════ {collected_date.strftime('%B %Y').upper()} ═══════════"
-                month_row = [month_label] + [''] * (len(combined_df.columns) - 1)
+                month_row = [month_label] + [''] * (width - 2) + ['month']
                 data_to_upload.append(month_row)
-                month_separator_rows.append(len(data_to_upload))  # Track for green color
                 current_date = None  # Reset date tracking for new month
 
             # Add DAILY separator if date changed
@@ -1285,166 +494,40 @@ try:
                 current_date = date_key
                 # Show date in readable format with day name
                 date_label = f"📅 {collected_date.strftime('%A, %B %d, %Y')}"
-                date_row = [date_label] + [''] * (len(combined_df.columns) - 1)
+                date_row = [date_label] + [''] * (width - 2) + ['day']
                 data_to_upload.append(date_row)
-                date_separator_rows.append(len(data_to_upload))  # Track for blue color
         except:
             pass
 
         # Add actual job data
         data_to_upload.append(row.values.tolist())
 
-    # Upload
-    worksheet.update(data_to_upload, 'A1')
-
-    # Calculate summary table size
-    summary_table_rows = len(summary_rows) + 2  # +2 for blank rows
+    # Upload only what changed since the last written layout (rows kept in place for viewers)
+    sheet_sync = SheetSync(sheet, worksheet)
+    sheet_sync.sync(data_to_upload, full=SHEET_FULL_REWRITE)
+    sheet_sync.print_report()
 
     # ========================================================================
-    # FORMATTING - Summary Table
-    # ========================================================================
-    print("Formatting summary table...")
-
-    # Format summary title row (row 1) - Blue background for sources, Green for status
-    worksheet.format('A1:B1', {
-        "backgroundColor": {"red": 0.2, "green": 0.4, "blue": 0.8},
-        "textFormat": {
-            "bold": True,
-            "fontSize": 13,
-            "fontFamily": "Arial",
-            "foregroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}
-        },
-        "horizontalAlignment": "CENTER"
-    })
-
-    worksheet.format('C1:D1', {
-        "backgroundColor": {"red": 0.2, "green": 0.7, "blue": 0.3},
-        "textFormat": {
-            "bold": True,
-            "fontSize": 13,
-            "fontFamily": "Arial",
-            "foregroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}
-        },
-        "horizontalAlignment": "CENTER"
-    })
-
-    # Format summary header row (row 2) - Light blue for sources, light green for status
-    worksheet.format('A2:B2', {
-        "backgroundColor": {"red": 0.7, "green": 0.8, "blue": 1.0},
-        "textFormat": {
-            "bold": True,
-            "fontSize": 11,
-            "fontFamily": "Arial"
-        },
-        "horizontalAlignment": "CENTER"
-    })
-
-    worksheet.format('C2:D2', {
-        "backgroundColor": {"red": 0.7, "green": 0.9, "blue": 0.7},
-        "textFormat": {
-            "bold": True,
-            "fontSize": 11,
-            "fontFamily": "Arial"
-        },
-        "horizontalAlignment": "CENTER"
-    })
-
-    # Format summary data rows
-    summary_end_row = len(summary_rows)
-    worksheet.format(f'A3:B{summary_end_row}', {
-        "textFormat": {
-            "fontSize": 10,
-            "fontFamily": "Arial"
-        }
-    })
-
-    # Bold the total rows
-    totals_start = summary_end_row - 3  # Last 3 rows before blank
-    worksheet.format(f'A{totals_start}:B{summary_end_row}', {
-        "textFormat": {
-            "bold": True,
-            "fontSize": 11,
-            "fontFamily": "Arial"
-        }
-    })
-
+    # FORMATTING - conditional-format rules, only when the layout changed
     # ========================================================================
-    # FORMATTING - Job Data Header
-    # ========================================================================
-    header_row = summary_table_rows + 1  # Header is after summary + blanks
-
-    # Format header row (blue background, white text, bold, centered)
-    worksheet.format(f'A{header_row}:O{header_row}', {
-        "backgroundColor": {"red": 0.27, "green": 0.45, "blue": 0.77},
-        "textFormat": {
-            "bold": True,
-            "fontSize": 11,
-            "fontFamily": "Arial",
-            "foregroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}
-        },
-        "horizontalAlignment": "CENTER",
-        "verticalAlignment": "MIDDLE"
-    })
-
-    # Freeze header row (including summary table)
-    worksheet.freeze(rows=header_row)
-
-    # Format all data cells - Wrap text, Arial font
-    data_start_row = header_row + 1
-    last_row = len(data_to_upload)
-    worksheet.format(f'A{data_start_row}:O{last_row}', {
-        "wrapStrategy": "WRAP",  # Wrap text in cells
-        "textFormat": {
-            "fontSize": 10,
-            "fontFamily": "Arial"
-        },
-        "verticalAlignment": "TOP"
-    })
-
-    # Set column widths for better readability
-    try:
-        worksheet.columns_auto_resize(0, len(combined_df.columns) - 1)
-    except:
-        pass  # If auto-resize fails, continue anyway
-
-    # ========================================================================
-    # FORMATTING FOR MONTH AND DATE SEPARATORS
-    # ========================================================================
-    print("Adding highlights for month and date separators...")
-
-    # Green highlight for month headers
-    for row_num in month_separator_rows:
-        try:
-            worksheet.format(f'A{row_num}:O{row_num}', {
-                "backgroundColor": {"red": 0.0, "green": 0.7, "blue": 0.0},  # Dark Green
-                "textFormat": {
-                    "bold": True,
-                    "fontSize": 13,
-                    "fontFamily": "Arial",
-                    "foregroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}  # White text
-                },
-                "horizontalAlignment": "CENTER"
-            })
-        except:
-            pass
-
-    # Blue highlight for daily separators
-    for row_num in date_separator_rows:
-        try:
-            worksheet.format(f'A{row_num}:O{row_num}', {
-                "backgroundColor": {"red": 0.3, "green": 0.6, "blue": 1.0},  # Light Blue
-                "textFormat": {
-                    "bold": True,
-                    "fontSize": 11,
-                    "fontFamily": "Arial",
-                    "foregroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}  # White text
-                },
-                "horizontalAlignment": "CENTER"
-            })
-        except:
-            pass  # Continue if formatting fails
+    header_row = len(summary_rows) + 3  # Header is after summary + 2 blanks
+    sheet_layout = SheetLayout(sheet, worksheet)
+    if sheet_layout.ensure(combined_df.columns.tolist(), header_row):
+        print(f"Sheet layout set up: {sheet_layout.api_calls} API calls ({sheet_layout.bytes / 1024:.1f} KB)")
+    else:
+        print("Sheet layout unchanged - no formatting calls")
 
     print("[OK] Google Sheet updated successfully!")
+
+    # Sheet holds this run's results - commit the job store and advance the search and board watermarks
+    job_store.commit()
+    sheet_sync.save()
+    sheet_layout.save()
+    search_watermarks.save()
+    known_jobs.save()
+    source_yield.save()
+    greenhouse.commit_sync_state()
+    workday.commit_seen_state()
     print(f"[OK] Sheet URL: https://docs.google.com/spreadsheets/d/{SHEET_ID}")
     print("="*80)
     print(f"\nSUCCESS! Sheet now has {len(combined_df)} total jobs!")
@@ -1466,8 +549,8 @@ try:
     print("📊 AGENT RUN SUMMARY")
     print("="*80)
     log_status(f"Total runtime: {int(duration)} seconds ({duration/60:.1f} minutes)", "INFO")
-    log_status(f"JobSpy searches: 8/8 completed", "SUCCESS")
-    log_status(f"Hospital scrapers: 15 attempted", "INFO")
+    log_status(f"JobSpy searches: {run_status['jobspy_searches_completed']}/{len(SEARCHES)} completed", "SUCCESS")
+    log_status(f"Hospital scrapers: {run_status['hospital_scrapers_completed']}/{len(HOSPITAL_SOURCES)} completed", "INFO")
     log_status(f"Jobs scraped this run: {len(new_jobs_df)}", "SUCCESS")
     log_status(f"🔥 NEW jobs added to sheet: {run_status['new_jobs_added']}", "SUCCESS")
     log_status(f"📝 Total jobs in sheet: {run_status['total_jobs_in_sheet']}", "SUCCESS")
@@ -1497,6 +580,9 @@ except Exception as e:
     print(f"\n[ERROR] Failed to update Google Sheets: {e}")
     print("="*80)
 
+# Uncommitted store changes (sheet update failed) roll back here
+job_store.close()
+
 # Print final status
 print("\n" + "="*80)
 if run_status["success"]:
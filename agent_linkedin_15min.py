@@ -3,11 +3,17 @@ UAE Nursing Jobs - LinkedIn 15-Minute Scraper
 Optimized for frequent updates - ONLY LinkedIn platform
 """
 
-import os, hashlib, re, sys
-from datetime import datetime, timezone, timedelta
+import os, sys
+from datetime import datetime, timedelta
 from pathlib import Path
 import pandas as pd
-from jobspy import scrape_jobs
+from search_executor import run_searches, print_search_report
+from search_watermarks import SearchWatermarks
+from known_jobs import KnownJobs, jobspy_uids
+from jobspy_normaliser import normalise_jobs, now_iso
+from job_record import COMPACT_COLUMNS, sheet_frame
+from sheet_index import SheetIndex
+from rate_limiter import get_scheduler
 import gspread
 from google.oauth2.service_account import Credentials
 
@@ -31,7 +37,7 @@ CREDS_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "service_account.json")
 # For 15-minute runs, search last 24 hours (fresh jobs, not too old)
 HOURS_OLD = 24  # Last 24 hours (1 day)
 LINKEDIN_ONLY = ["linkedin"]
-
+SHEET_PAGE_ROWS = int(os.getenv("SHEET_PAGE_ROWS", "0"))  # >0 reads the sheet index in pages of this many rows
 now = datetime.now()
 start_date = now - timedelta(hours=HOURS_OLD)
 
@@ -59,96 +65,45 @@ def log_status(message, status_type="INFO"):
     symbol = symbols.get(status_type, "ℹ️")
     print(f"[{timestamp}] {symbol} {message}")
 
-# ============================================================================
-# HELPER FUNCTIONS
-# ============================================================================
-
-def now_iso():
-    return datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
-
-def uid_for(row) -> str:
-    """Generate unique ID for deduplication"""
-    if isinstance(row, dict):
-        key = "|".join([
-            str(row.get("Job Title","")).strip().lower(),
-            str(row.get("Company Name","")).strip().lower(),
-            str(row.get("Location","")).strip().lower(),
-            str(row.get("Apply Link","")).strip().lower(),
-        ])
-    else:
-        key = "|".join([
-            str(row.get("Job Title") if hasattr(row, 'get') else row["Job Title"]).strip().lower(),
-            str(row.get("Company Name") if hasattr(row, 'get') else row["Company Name"]).strip().lower(),
-            str(row.get("Location") if hasattr(row, 'get') else row["Location"]).strip().lower(),
-            str(row.get("Apply Link") if hasattr(row, 'get') else row["Apply Link"]).strip().lower(),
-        ])
-    return hashlib.md5(key.encode("utf-8")).hexdigest()
-
 # ============================================================================
 # LINKEDIN SCRAPING (Optimized for 15-min intervals)
 # ============================================================================
 
 log_status("Starting LinkedIn job search...", "INFO")
 
-all_jobs = []
-
-try:
+SEARCHES = [
     # Search 1: Dubai nursing
-    log_status("[1/4] Dubai nursing jobs (LinkedIn)...", "INFO")
-    jobs1 = scrape_jobs(
-        site_name=LINKEDIN_ONLY,
-        search_term="nurse nursing registered nurse",
-        location="Dubai",
-        results_wanted=50,  # Reduced for faster runs
-        hours_old=HOURS_OLD,
-        country_indeed='United Arab Emirates'
-    )
-    all_jobs.append(jobs1)
-    run_status["searches_completed"] += 1
-
+    {"label": "Dubai nursing jobs", "search_term": "nurse nursing registered nurse", "location": "Dubai",
+     "results_wanted": 50,  # Reduced for faster runs
+     "country_indeed": 'United Arab Emirates'},
     # Search 2: DHA licensed
-    log_status("[2/4] DHA licensed nursing jobs (LinkedIn)...", "INFO")
-    jobs2 = scrape_jobs(
-        site_name=LINKEDIN_ONLY,
-        search_term="DHA licensed nurse Dubai Health Authority",
-        location="",
-        results_wanted=50,
-        hours_old=HOURS_OLD
-    )
-    all_jobs.append(jobs2)
-    run_status["searches_completed"] += 1
-
+    {"label": "DHA licensed nursing jobs", "search_term": "DHA licensed nurse Dubai Health Authority",
+     "location": "", "results_wanted": 50},
     # Search 3: Abu Dhabi
-    log_status("[3/4] Abu Dhabi nursing jobs (LinkedIn)...", "INFO")
-    jobs3 = scrape_jobs(
-        site_name=LINKEDIN_ONLY,
-        search_term="nurse nursing healthcare",
-        location="Abu Dhabi",
-        results_wanted=50,
-        hours_old=HOURS_OLD,
-        country_indeed='United Arab Emirates'
-    )
-    all_jobs.append(jobs3)
-    run_status["searches_completed"] += 1
-
+    {"label": "Abu Dhabi nursing jobs", "search_term": "nurse nursing healthcare", "location": "Abu Dhabi",
+     "results_wanted": 50, "country_indeed": 'United Arab Emirates'},
     # Search 4: MOH/HAAD/DHA licensed roles
-    log_status("[4/4] MOH/HAAD licensed nurses (LinkedIn)...", "INFO")
-    jobs4 = scrape_jobs(
-        site_name=LINKEDIN_ONLY,
-        search_term="MOH HAAD licensed nurse Abu Dhabi",
-        location="United Arab Emirates",
-        results_wanted=50,
-        hours_old=HOURS_OLD
-    )
-    all_jobs.append(jobs4)
-    run_status["searches_completed"] += 1
-
-    log_status(f"LinkedIn searches completed: {run_status['searches_completed']}/4", "SUCCESS")
-
-except Exception as e:
-    log_status(f"LinkedIn scraping error: {e}", "ERROR")
-    run_status["errors"].append(str(e))
-    all_jobs = []
+    {"label": "MOH/HAAD licensed nurses", "search_term": "MOH HAAD licensed nurse Abu Dhabi",
+     "location": "United Arab Emirates", "results_wanted": 50},
+]
+
+# Each search only looks back to its last successful run (max HOURS_OLD)
+search_watermarks = SearchWatermarks("linkedin_15min", HOURS_OLD)
+# ...and stops paging once a whole page is postings earlier runs already handled
+known_jobs = KnownJobs("linkedin_15min")
+
+all_jobs, search_report = run_searches(SEARCHES, LINKEDIN_ONLY, HOURS_OLD, watermarks=search_watermarks,
+                                       known=known_jobs)
+print_search_report(search_report)
+get_scheduler().print_stats()
+
+for entry in search_report:
+    if entry["errors"]:
+        run_status["errors"].extend(f"LinkedIn '{entry['label']}' - {error}" for error in entry["errors"])
+    else:
+        run_status["searches_completed"] += 1
+log_status(f"LinkedIn searches completed: {run_status['searches_completed']}/{len(SEARCHES)}", "SUCCESS")
+all_jobs = [df for df in all_jobs if not df.empty]
 
 # ============================================================================
 # PROCESS RESULTS
@@ -159,27 +114,15 @@ if all_jobs:
 
     jobs_df = pd.concat(all_jobs, ignore_index=True)
     jobs_df = jobs_df.drop_duplicates(subset=['job_url'], keep='first')
+    known_jobs.remember(jobspy_uids(jobs_df))
 
     run_status["total_jobs_scraped"] = len(jobs_df)
     log_status(f"Total unique jobs scraped: {len(jobs_df)}", "SUCCESS")
 
-    new_jobs = []
-    for _, row in jobs_df.iterrows():
-        new_jobs.append({
-            "Job Title": row['title'],
-            "Company Name": row['company'],
-            "Location": row['location'],
-            "Apply Link": row['job_url'],
-            "Source": f"{row['site'].capitalize()} (15-min)",
-            "Collected At": now_iso(),
-            "Description": row.get('description', ''),
-            "_uid": ""
-        })
-
-    new_jobs_df = pd.DataFrame(new_jobs)
-
-    # Generate UIDs
-    new_jobs_df["_uid"] = new_jobs_df.apply(uid_for, axis=1)
+    # Same normaliser as agent.py, keeping this sheet's columns and full descriptions
+    new_jobs_df = normalise_jobs(jobs_df, source_label="15-min", collected_at=now_iso(),
+                                 description_chars=None)[COMPACT_COLUMNS]
+    new_jobs_df = sheet_frame(new_jobs_df)
 
     log_status(f"Prepared {len(new_jobs_df)} jobs for upload", "INFO")
 
@@ -205,35 +148,23 @@ try:
 
     log_status("Connected to Google Sheets", "SUCCESS")
 
-    # Load existing data
-    log_status("Loading existing jobs from sheet...", "INFO")
-    existing_data = worksheet.get_all_values()
-
-    if len(existing_data) > 1:
-        headers = existing_data[0]
-        existing_df = pd.DataFrame(existing_data[1:], columns=headers)
-        log_status(f"Found {len(existing_df)} existing jobs in sheet", "INFO")
-    else:
-        existing_df = pd.DataFrame()
-        log_status("Sheet is empty, will create new sheet", "INFO")
-
-    # Filter for separator rows and job rows
-    if not existing_df.empty and "_uid" in existing_df.columns:
-        separator_mask = existing_df["_uid"].str.strip() == ""
-        job_rows_df = existing_df[~separator_mask].copy()
-        separator_rows = existing_df[separator_mask].copy()
-        existing_uids = set(job_rows_df["_uid"].dropna())
+    # Load the UIDs, timestamps and links of existing jobs - not the whole sheet
+    log_status("Loading existing job index from sheet...", "INFO")
+    sheet_index = SheetIndex(worksheet, page_rows=SHEET_PAGE_ROWS).load()
+    sheet_index.print_report()
+    existing_uids = sheet_index.uids
+    existing_keys = sheet_index.keys
+    if sheet_index.rows:
         log_status(f"Existing unique job UIDs: {len(existing_uids)}", "INFO")
     else:
-        job_rows_df = pd.DataFrame()
-        separator_rows = pd.DataFrame()
-        existing_uids = set()
+        log_status("Sheet is empty, will create new sheet", "INFO")
 
-    # Filter NEW jobs only
+    # Filter NEW jobs only (by UID and by LinkedIn job ID, whatever link it was stored under)
     if not new_jobs_df.empty and not existing_uids:
         truly_new = new_jobs_df.copy()
     elif not new_jobs_df.empty:
-        truly_new = new_jobs_df[~new_jobs_df["_uid"].isin(existing_uids)].copy()
+        known_key = pd.Series(existing_keys.known_mask(new_jobs_df["Apply Link"]), index=new_jobs_df.index)
+        truly_new = new_jobs_df[~new_jobs_df["_uid"].isin(existing_uids) & ~known_key].copy()
     else:
         truly_new = pd.DataFrame()
 
@@ -250,10 +181,6 @@ try:
         # Append new jobs at the END of existing data (will appear at bottom)
         log_status("Appending new jobs to sheet...", "INFO")
 
-        # Get current sheet row count
-        existing_row_count = len(existing_data)
-        start_row = existing_row_count + 1
-
         # Convert to list format for append
         new_rows = truly_new.values.tolist()
 
@@ -266,12 +193,15 @@ try:
         log_status("No new LinkedIn jobs found in last hour", "INFO")
 
     run_status["success"] = True
-    run_status["total_jobs_in_sheet"] = len(job_rows_df) + new_jobs_count
+    # New jobs are in the sheet - advance the search watermarks
+    search_watermarks.save()
+    known_jobs.save()
+    run_status["total_jobs_in_sheet"] = len(existing_uids) + new_jobs_count
 
 except Exception as e:
     log_status(f"Google Sheets error: {e}", "ERROR")
     run_status["errors"].append(str(e))
-    run_status["total_jobs_in_sheet"] = len(job_rows_df) if 'job_rows_df' in locals() else 0
+    run_status["total_jobs_in_sheet"] = len(existing_uids) if 'existing_uids' in locals() else 0
     import traceback
     traceback.print_exc()
 
@@ -286,7 +216,7 @@ print("\n" + "="*80)
 print("📊 LINKEDIN 15-MIN SCRAPER - RUN SUMMARY")
 print("="*80)
 log_status(f"Total runtime: {int(duration)} seconds", "INFO")
-log_status(f"LinkedIn searches: {run_status['searches_completed']}/3 completed", "SUCCESS")
+log_status(f"LinkedIn searches: {run_status['searches_completed']}/{len(SEARCHES)} completed", "SUCCESS")
 log_status(f"Jobs scraped this run: {run_status['total_jobs_scraped']}", "SUCCESS")
 log_status(f"🔥 NEW jobs added to sheet: {run_status['new_jobs_added']}", "SUCCESS")
 log_status(f"📝 Total jobs in sheet: {run_status['total_jobs_in_sheet']}", "SUCCESS")
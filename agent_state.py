@@ -0,0 +1,42 @@
+"""
+Persistent agent state between runs
+Everything lives under AGENT_STATE_DIR, which the workflows keep with actions/cache
+"""
+
+import json, os, tempfile
+from pathlib import Path
+
+STATE_DIR = Path(os.getenv("AGENT_STATE_DIR", ".agent_state"))
+
+def state_path(*parts):
+    """Path inside the state directory, creating parent folders"""
+    path = STATE_DIR.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+def load_json(name, default):
+    """Load a JSON state file, or default if it is missing or corrupt"""
+    try:
+        return json.loads(state_path(name).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return default
+
+def write_atomic(path, data):
+    """Write bytes so a killed run never leaves a half-written file behind"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def save_json(name, data):
+    """Atomically save a JSON state file"""
+    write_atomic(state_path(name), json.dumps(data, ensure_ascii=False, indent=1).encode("utf-8"))
@@ -0,0 +1,57 @@
+"""
+Micro-benchmark: BeautifulSoup html.parser vs lxml job-listing extraction
+
+Usage:
+    python benchmarks/bench_html_parsing.py [saved_page.html ...]
+
+Without arguments a large synthetic careers page (mega-menu, inline
+scripts, 300 job cards) is used. Save real pages with e.g.
+    curl -L https://www.asterdmhealthcare.com/careers -o aster.html
+"""
+
+import sys, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from html_parsing import JobListingExtractor
+
+REPEAT = 20
+
+def synthetic_page(cards=300):
+    nav = "".join(f'<li class="menu-item career-link"><a class="name" href="/m/{i}">Menu {i}</a></li>' for i in range(400))
+    script = "<script>" + "var x = {'job': 'career'};" * 2000 + "</script>"
+    body = "".join(
+        f'<div class="job-card"><div class="meta"><h3 class="job-title">{"Registered Nurse" if i % 3 else "Pharmacist"} {i}</h3>'
+        f'<p>{"Lorem ipsum dolor sit amet. " * 20}</p><a href="/jobs/{i}">Apply</a></div></div>'
+        for i in range(cards)
+    )
+    return f"<html><head>{script}<style>{'.a{color:red}' * 2000}</style></head><body><nav><ul>{nav}</ul></nav>{body}{script}</body></html>"
+
+def is_subsequence(short, long):
+    items = iter(long)
+    return all(any(item == other for other in items) for item in short)
+
+def best_of(fn, html):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(html)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(paths):
+    pages = [(path, Path(path).read_text(encoding="utf-8", errors="replace")) for path in paths] or [("synthetic", synthetic_page())]
+    extractor = JobListingExtractor(r'job|career', r'title|name')
+    unlimited = JobListingExtractor(r'job|career', r'title|name', limit=None)
+
+    print(f"{'page':<30} {'KB':>7} {'bs4 ms':>9} {'lxml ms':>9} {'speedup':>8}  same")
+    for name, html in pages:
+        bs4_time = best_of(extractor.extract_bs4, html)
+        lxml_time = best_of(extractor.extract_lxml, html)
+        # bs4 also returns cards inside <nav>/<script>, which the lxml path skips on purpose
+        same = is_subsequence(unlimited.extract_lxml(html), unlimited.extract_bs4(html))
+        print(f"{Path(name).name[:30]:<30} {len(html) / 1024:>7.0f} {bs4_time * 1000:>9.1f} {lxml_time * 1000:>9.1f} "
+              f"{bs4_time / lxml_time:>7.1f}x  {same}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
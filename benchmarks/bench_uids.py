@@ -0,0 +1,68 @@
+"""
+Micro-benchmark: df.apply(uid_for, axis=1) vs column-wise uids_for(df)
+
+Usage:
+    python benchmarks/bench_uids.py [rows ...]
+
+Defaults to 1k, 100k and 1M rows of synthetic sheet data with the messy
+values real scrapes contain (None, NaN, padding, mixed case, numbers).
+"""
+
+import hashlib, sys, time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from job_uids import uids_for
+
+SIZES = [1_000, 100_000, 1_000_000]
+
+def uid_for_rowwise(row) -> str:
+    """The original row-wise implementation, kept as the reference"""
+    if isinstance(row, dict):
+        key = "|".join([
+            str(row.get("Job Title","")).strip().lower(),
+            str(row.get("Company Name","")).strip().lower(),
+            str(row.get("Location","")).strip().lower(),
+            str(row.get("Apply Link","")).strip().lower(),
+        ])
+    else:
+        key = "|".join([
+            str(row.get("Job Title") if hasattr(row, 'get') else row["Job Title"]).strip().lower(),
+            str(row.get("Company Name") if hasattr(row, 'get') else row["Company Name"]).strip().lower(),
+            str(row.get("Location") if hasattr(row, 'get') else row["Location"]).strip().lower(),
+            str(row.get("Apply Link") if hasattr(row, 'get') else row["Apply Link"]).strip().lower(),
+        ])
+    return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+def synthetic_jobs(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    titles = np.array(["Registered Nurse", " Staff Nurse ", "ICU NURSE", "Midwife", "Nurse Educator\t"], dtype=object)
+    companies = np.array(["NMC Healthcare", "Aster DM", None, "Cleveland Clinic", np.nan], dtype=object)
+    locations = np.array(["Dubai, AE", "Abu Dhabi", " UAE", None, 42], dtype=object)
+    ids = rng.integers(0, rows * 10, rows)
+    return pd.DataFrame({
+        "Job Title": titles[rng.integers(0, len(titles), rows)],
+        "Company Name": companies[rng.integers(0, len(companies), rows)],
+        "Location": locations[rng.integers(0, len(locations), rows)],
+        "Apply Link": [f"https://www.linkedin.com/jobs/view/{i}" for i in ids],
+        "Source": "Linkedin (JobSpy)",
+    })
+
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df)
+    return result, time.perf_counter() - start
+
+def main(sizes):
+    print(f"{'rows':>9} {'apply s':>9} {'batch s':>9} {'speedup':>8}  same")
+    for rows in sizes:
+        df = synthetic_jobs(rows)
+        rowwise, rowwise_time = timed(lambda frame: frame.apply(uid_for_rowwise, axis=1), df)
+        batched, batched_time = timed(uids_for, df)
+        same = rowwise.tolist() == batched.tolist()
+        print(f"{rows:>9} {rowwise_time:>9.3f} {batched_time:>9.3f} {rowwise_time / batched_time:>7.1f}x  {same}")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
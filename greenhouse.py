@@ -0,0 +1,90 @@
+"""
+Incremental Greenhouse board sync
+Keeps a per-board updated_at watermark and job-id index so each run only
+processes new or updated jobs, and reports jobs that left the board
+"""
+
+import re, threading
+from datetime import datetime
+from http_session import get_session
+from agent_state import load_json, save_json
+
+BOARD_API = "https://boards-api.greenhouse.io/v1/boards/{board}/jobs"
+
+_fetched = {}   # board -> (state, tombstones) of this run's fetch, until its source parsed fine
+_pending = {}   # board -> state to save once the run has been committed
+_tombstones = {}  # board -> jobs that disappeared this run
+_lock = threading.Lock()
+
+def board_url(board):
+    return BOARD_API.format(board=board)
+
+def _state_file(board):
+    return "greenhouse/" + re.sub(r'[^A-Za-z0-9_.-]', '_', board) + ".json"
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def sync_board(board, timeout=10, full=False):
+    """
+    Fetch a board and diff it against the last committed run.
+
+    Returns {'jobs': [...], 'tombstones': [...], 'total': n}: 'jobs' are only
+    the postings that are new or whose updated_at moved (every posting when
+    full=True or on the first run), 'tombstones' the previously indexed
+    postings no longer on the board. Neither is staged for
+    commit_sync_state() / tombstone_links() until accept_board(board).
+    """
+    response = get_session().get(board_url(board), timeout=timeout)
+    response.raise_for_status()
+    jobs = response.json().get('jobs', [])
+
+    state = load_json(_state_file(board), {"watermark": "", "jobs": {}})
+    known = state["jobs"]
+    current = {str(job.get('id') or job.get('absolute_url')): job for job in jobs}
+
+    times = [t for t in (_parse_time(job.get('updated_at')) for job in jobs) if t is not None]
+    watermark = max(times).isoformat() if times else state["watermark"]
+
+    if not full and known and watermark == state["watermark"] and current.keys() == known.keys():
+        # Nothing on the board moved past the watermark - skip per-job work
+        changed = []
+    else:
+        changed = [
+            job for job_id, job in current.items()
+            if full or job_id not in known or known[job_id]["updated_at"] != job.get('updated_at', '')
+        ]
+    tombstones = [dict(known[job_id], id=job_id) for job_id in known.keys() - current.keys()]
+
+    with _lock:
+        _fetched[board] = ({
+            "watermark": watermark,
+            "jobs": {
+                job_id: {"updated_at": job.get('updated_at', ''), "absolute_url": job.get('absolute_url', '')}
+                for job_id, job in current.items()
+            },
+        }, tombstones)
+
+    print(f"Greenhouse {board}: {len(changed)} new/updated of {len(current)} jobs, {len(tombstones)} removed")
+    return {"jobs": changed, "tombstones": tombstones, "total": len(current)}
+
+def accept_board(board):
+    """Stage the new state and tombstones of a board whose source was parsed successfully"""
+    with _lock:
+        if board in _fetched:
+            _pending[board], _tombstones[board] = _fetched.pop(board)
+
+def tombstone_links():
+    """Apply links of every job that left its board this run"""
+    with _lock:
+        return {job["absolute_url"] for jobs in _tombstones.values() for job in jobs if job.get("absolute_url")}
+
+def commit_sync_state():
+    """Persist watermarks and indexes - call only after the sheet was updated"""
+    with _lock:
+        for board, state in _pending.items():
+            save_json(_state_file(board), state)
+        _pending.clear()
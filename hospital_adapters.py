@@ -0,0 +1,158 @@
+"""
+Config-driven hospital adapters
+Hospitals are listed in hospitals.json; each entry names an adapter kind
+(greenhouse, workday or html) that turns it into a source for hospital_engine
+"""
+
+import json, os
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from html_parsing import JobListingExtractor
+from job_record import JobRecord
+from nursing_matcher import NURSING
+import greenhouse
+import workday
+
+HOSPITALS_FILE = Path(__file__).with_name("hospitals.json")
+BROWSER_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+# Greenhouse boards only report new/updated jobs; set to 1 to re-read whole boards
+GREENHOUSE_FULL_SYNC = os.getenv("GREENHOUSE_FULL_SYNC", "0") == "1"
+
+def now_iso():
+    return datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
+
+def nursing_matcher(entry):
+    """Central nursing matcher plus any extra 'keywords' of a hospitals.json entry"""
+    return NURSING.with_keywords(entry.get("keywords")).matches
+
+def make_job(title, company_name, location, apply_link, source, platform=None, description=''):
+    """One JobRecord for a hospital posting"""
+    collected_at = now_iso()
+    return JobRecord(title, company_name, location, apply_link, source, platform=platform,
+                     description=description, published=collected_at.split('T')[0], collected_at=collected_at)
+
+def restamp_jobs(jobs):
+    """Jobs reused from the response cache (plain rows) come back as JobRecords with this run's timestamps"""
+    collected_at = now_iso()
+    return [JobRecord.from_dict(job).restamped(collected_at) for job in jobs]
+
+# ============================================================================
+# PARSERS
+# ============================================================================
+
+def parse_greenhouse_jobs(changes, company_name, is_nursing, location_filter=""):
+    """Parse the new/updated jobs of a Greenhouse board sync"""
+    hospital_jobs = []
+    for job in changes['jobs']:
+        title = job.get('title', '')
+        location = job.get('location', {}).get('name', '') if isinstance(job.get('location'), dict) else str(job.get('location', ''))
+
+        if not is_nursing(title):
+            continue
+        # Filter by location if specified
+        if location_filter and location_filter.lower() not in location.lower():
+            continue
+
+        hospital_jobs.append(make_job(title, company_name, location, job.get('absolute_url', ''),
+                                      f'{company_name} (Direct)', description=job.get('content', '')[:500]))
+    return hospital_jobs
+
+def parse_workday_jobs(postings, platform, company_name, default_location, host, site, source):
+    """Convert Workday postings into JobRecords"""
+    jobs = []
+    for job in postings:
+        title_obj = job.get('title', '')
+        title = title_obj if isinstance(title_obj, str) else ''
+        jobs.append(make_job(title, company_name, job.get('locationsText', default_location),
+                             workday.posting_url(host, site, job), source, platform=platform))
+    return jobs
+
+def parse_career_page(response, company_name, url, base_url, location, source, extractor, is_nursing):
+    """Parse a hospital careers page (adjust selectors in hospitals.json)"""
+    if response.status_code != 200:
+        print(f"Could not access {company_name} careers page")
+        return []
+
+    jobs = []
+    for title, href in extractor.extract(response.text):
+        if not is_nursing(title):
+            continue
+
+        apply_link = href or url
+        if not apply_link.startswith('http'):
+            apply_link = base_url + apply_link
+
+        jobs.append(make_job(title, company_name, location, apply_link, source))
+    return jobs
+
+# ============================================================================
+# ADAPTER REGISTRY
+# ============================================================================
+
+ADAPTERS = {}
+
+def adapter(kind):
+    """Register a builder turning a hospitals.json entry into a source"""
+    def register(builder):
+        ADAPTERS[kind] = builder
+        return builder
+    return register
+
+@adapter("greenhouse")
+def greenhouse_source(entry):
+    name = entry["name"]
+    return {
+        "name": name,
+        "url": greenhouse.board_url(entry["board"]),
+        "fetch": partial(greenhouse.sync_board, entry["board"], full=GREENHOUSE_FULL_SYNC),
+        "accept": partial(greenhouse.accept_board, entry["board"]),
+        "incremental": True,
+        "parse": partial(parse_greenhouse_jobs, company_name=name,
+                         is_nursing=nursing_matcher(entry),
+                         location_filter=entry.get("location_filter", "")),
+    }
+
+@adapter("workday")
+def workday_source(entry):
+    host, tenant, site = entry["host"], entry["tenant"], entry["site"]
+    return {
+        "name": entry["name"],
+        "url": workday.jobs_url(host, tenant, site),
+        "fetch": partial(workday.fetch_postings, host, tenant, site, entry.get("search_text", "nurse")),
+        "accept": partial(workday.accept_postings, host, tenant, site),
+        "total_timeout": entry.get("total_timeout", 40),
+        "parse": partial(parse_workday_jobs, platform=entry.get("platform", entry["name"]), company_name=entry["name"],
+                         default_location=entry.get("default_location", "UAE"), host=host, site=site,
+                         source=entry.get("source", f"{entry['name']} (Direct)")),
+    }
+
+@adapter("html")
+def career_page_source(entry):
+    return {
+        "name": entry["name"],
+        "url": entry["url"],
+        "headers": BROWSER_HEADERS,
+        "parse": partial(parse_career_page, company_name=entry["name"], url=entry["url"],
+                         base_url=entry["base_url"], location=entry.get("location", "UAE"),
+                         source=entry.get("source", f"{entry['name']} (Direct)"),
+                         extractor=JobListingExtractor(entry.get("container_class", r'job|career'),
+                                                       entry.get("title_class", r'title|name')),
+                         is_nursing=nursing_matcher(entry)),
+    }
+
+def load_hospital_sources(path=HOSPITALS_FILE):
+    """Build engine sources for every enabled hospital, in file order"""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+
+    sources = []
+    for entry in entries:
+        if not entry.get("enabled", True):
+            continue
+        builder = ADAPTERS.get(entry.get("kind"))
+        if builder is None:
+            print(f"Skipping {entry.get('name', '?')}: unknown adapter kind '{entry.get('kind')}'")
+            continue
+        sources.append(builder(entry))
+    return sources
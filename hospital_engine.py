@@ -0,0 +1,167 @@
+"""
+Async fetch engine for the hospital direct scrapers
+Fires every hospital request at once and parses each response as it arrives
+"""
+
+import asyncio, time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from http_session import get_session
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+DEFAULT_TIMEOUT = 10  # Seconds per request
+HOST_TIMEOUTS = {
+    # Workday tenants answer slowly but reliably
+    "mediclinic.wd3.myworkdayjobs.com": 15,
+    "clevelandclinic.wd5.myworkdayjobs.com": 15,
+}
+DEADLINE = 45  # Seconds for the whole hospital stage
+
+def host_timeout(url, host_timeouts=None):
+    """Timeout for the host serving url"""
+    timeouts = dict(HOST_TIMEOUTS, **(host_timeouts or {}))
+    return timeouts.get(urlparse(url).netloc, DEFAULT_TIMEOUT)
+
+def _cacheable(source, cache):
+    """Plain GET sources go through the ResponseCache; sources with their own fetch never do"""
+    return cache is not None and "fetch" not in source and source.get("method", "GET") == "GET"
+
+def _request(source, timeout, cache):
+    """Blocking HTTP call described by a source dict -> (response, unchanged)"""
+    if "fetch" in source:
+        # Source drives its own requests (e.g. paginated APIs)
+        return source["fetch"](timeout=timeout), False
+    if _cacheable(source, cache):
+        return cache.fetch(get_session(), source["url"], source.get("headers"), timeout)
+    response = get_session().request(
+        source.get("method", "GET"),
+        source["url"],
+        headers=source.get("headers"),
+        json=source.get("json"),
+        timeout=timeout,
+    )
+    return response, False
+
+async def _fetch_and_parse(loop, executor, source, timeout, cache, restamp):
+    start = time.perf_counter()
+    # requests' timeout is per socket operation; wait_for bounds the whole call
+    response, unchanged = await asyncio.wait_for(
+        loop.run_in_executor(executor, _request, source, timeout, cache), source.get("total_timeout", timeout * 2)
+    )
+    fetched = time.perf_counter()
+    jobs = cache.jobs_for(source["url"]) if unchanged else None
+    if jobs is not None:
+        # Page has not changed since the last run - skip parsing
+        jobs = restamp(jobs)
+    else:
+        jobs = source["parse"](response)
+        if _cacheable(source, cache) and response.status_code == 200:
+            # The cache stores plain rows; restamp() turns them back into records
+            cache.remember_jobs(source["url"], [job.to_dict() for job in jobs])
+    end = time.perf_counter()
+    return jobs, {"fetch": fetched - start, "parse": end - fetched, "total": end - start}, unchanged
+
+async def _run(sources, deadline, host_timeouts, cache, restamp, on_result):
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max(len(sources), 1))
+    results = [None] * len(sources)
+    started = time.perf_counter()
+    try:
+        tasks = {
+            asyncio.create_task(
+                _fetch_and_parse(loop, executor, source, host_timeout(source["url"], host_timeouts), cache, restamp)
+            ): i
+            for i, source in enumerate(sources)
+        }
+        pending = set(tasks)
+        stop_at = loop.time() + deadline
+        while pending:
+            remaining = stop_at - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                i = tasks[task]
+                name = sources[i]["name"]
+                error = task.exception()
+                if error is None:
+                    jobs, timing, unchanged = task.result()
+                    status = "unchanged" if unchanged else "ok"
+                    seconds = timing["total"]
+                    results[i] = {"name": name, "jobs": jobs, "seconds": seconds, "status": status, "error": "",
+                                  "fetch_seconds": timing["fetch"], "parse_seconds": timing["parse"]}
+                    print(f"Found {len(jobs)} nursing jobs from {name} ({seconds:.1f}s{', unchanged' if unchanged else ''})")
+                    if on_result is not None:
+                        # In a thread: a full downstream queue must not stall the event loop
+                        await loop.run_in_executor(None, on_result, results[i])
+                else:
+                    status = "timeout" if isinstance(error, asyncio.TimeoutError) else "error"
+                    seconds = time.perf_counter() - started
+                    results[i] = {"name": name, "jobs": [], "seconds": seconds, "status": status, "error": str(error) or status}
+                    print(f"Error scraping {name}: {error or status}")
+
+        # Overall deadline reached - cancel whatever is still in flight
+        for task in pending:
+            task.cancel()
+            i = tasks[task]
+            results[i] = {"name": sources[i]["name"], "jobs": [], "seconds": deadline,
+                          "status": "cancelled", "error": f"cancelled at {deadline}s deadline"}
+            print(f"Cancelled {sources[i]['name']} - stage deadline of {deadline}s reached")
+        await asyncio.gather(*pending, return_exceptions=True)
+    finally:
+        # Do not wait for abandoned sockets; their own timeout will close them
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+def run_hospital_sources(sources, deadline=DEADLINE, host_timeouts=None, cache=None, restamp=None, health=None,
+                         on_result=None):
+    """
+    Fetch and parse every hospital source concurrently.
+
+    sources: list of dicts with 'name', 'url', optional 'method', 'headers'
+    and 'json', and a 'parse(response) -> list of JobRecord' callable.
+    A source may instead bring its own 'fetch(timeout)' (plus an optional
+    'total_timeout'); parse then receives whatever fetch returned, and an
+    optional 'accept()' is called once the source ended with status 'ok'.
+    With a ResponseCache, GET sources are fetched conditionally and the jobs
+    of an unchanged page are reused after passing through restamp(rows).
+    With a SourceHealth, sources whose circuit is open are skipped (status
+    'skipped') and every fetched source's outcome is recorded.
+    on_result: called with each successful report entry as soon as its
+    source is parsed, in completion order
+    Returns (jobs, report): the JobRecords in source order - the same list the
+    sequential scrapers produced - and one report entry per source.
+    """
+    restamp = restamp or (lambda jobs: jobs)
+    allowed = [health is None or health.allow(source["name"]) for source in sources]
+    to_fetch = [source for source, allow in zip(sources, allowed) if allow]
+    fetched = iter(asyncio.run(_run(to_fetch, deadline, host_timeouts, cache, restamp, on_result)))
+    report = []
+    for source, allow in zip(sources, allowed):
+        if not allow:
+            report.append(health.skipped_entry(source["name"]))
+            continue
+        entry = next(fetched)
+        if entry["status"] == "ok" and "accept" in source:
+            # Source state (seen postings, board watermarks) only advances once its jobs were parsed
+            source["accept"]()
+        if health is not None:
+            # Incremental sources (Greenhouse) legitimately return nothing new
+            health.record(entry, zero_yield_ok=source.get("incremental", False))
+        report.append(entry)
+    jobs = [job for entry in report for job in entry["jobs"]]
+    return jobs, report
+
+def print_hospital_report(report):
+    """Print per-source status and timing"""
+    print("\nHospital scraper report:")
+    for i, entry in enumerate(report, 1):
+        line = f"  [{i}/{len(report)}] {entry['name']}: {len(entry['jobs'])} jobs in {entry['seconds']:.1f}s"
+        if "parse_seconds" in entry:
+            line += f" (fetch {entry['fetch_seconds']:.2f}s, parse {entry['parse_seconds']:.3f}s)"
+        line += f" {entry['status']}"
+        if entry["error"]:
+            line += f" ({entry['error']})"
+        print(line)
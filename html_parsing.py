@@ -0,0 +1,79 @@
+"""
+Fast job-listing extraction for hospital career pages
+lxml parse with precompiled XPath; script, style and nav subtrees are dropped
+before matching. The BeautifulSoup path is kept for comparison (HTML_PARSER=bs4)
+"""
+
+import os, re
+from lxml import etree
+from bs4 import BeautifulSoup
+
+HTML_PARSER = os.getenv("HTML_PARSER", "lxml")  # "lxml" or "bs4"
+REGEX_NS = {"re": "http://exslt.org/regular-expressions"}
+# Subtrees that never hold job listings on the career pages we scrape
+SKIP_TAGS = ("script", "style", "noscript", "template", "svg", "nav")
+
+_parser = etree.HTMLParser(encoding="utf-8", remove_comments=True, remove_pis=True,
+                           no_network=True, collect_ids=False)
+
+def _tag_test(tags):
+    return " or ".join(f"self::{tag}" for tag in tags)
+
+def _text(elem):
+    """Same as BeautifulSoup get_text(strip=True)"""
+    return "".join(part.strip() for part in elem.itertext())
+
+class JobListingExtractor:
+    """Finds (title, href) pairs of job cards on a careers page"""
+
+    def __init__(self, container_class, title_class, container_tags=('div', 'article', 'li'),
+                 title_tags=('h2', 'h3', 'h4', 'a'), limit=20):
+        self.container_re = re.compile(container_class, re.I)
+        self.title_re = re.compile(title_class, re.I)
+        self.container_tags = list(container_tags)
+        self.title_tags = list(title_tags)
+        self.limit = limit
+        self._containers = etree.XPath(
+            f"//*[{_tag_test(container_tags)}][re:test(@class, $pattern, 'i')]", namespaces=REGEX_NS)
+        self._title = etree.XPath(
+            f"(.//*[{_tag_test(title_tags)}][re:test(@class, $pattern, 'i')])[1]", namespaces=REGEX_NS)
+        self._link = etree.XPath("(.//a[@href])[1]")
+
+    def extract(self, html):
+        """List of (title, href or None) for the first `limit` job containers"""
+        if HTML_PARSER == "bs4":
+            return self.extract_bs4(html)
+        return self.extract_lxml(html)
+
+    def extract_lxml(self, html):
+        root = etree.fromstring(html.encode("utf-8"), _parser) if html else None
+        if root is None:
+            return []
+        etree.strip_elements(root, *SKIP_TAGS, with_tail=False)
+
+        listings = []
+        for container in self._containers(root, pattern=self.container_re.pattern)[:self.limit]:
+            titles = self._title(container, pattern=self.title_re.pattern)
+            if not titles:
+                continue
+            title_elem = titles[0]
+            link_elem = None
+            if title_elem.tag == 'a':
+                links = self._link(container)
+                link_elem = links[0] if links else title_elem
+            href = link_elem.get('href') if link_elem is not None else None
+            listings.append((_text(title_elem), href))
+        return listings
+
+    def extract_bs4(self, html):
+        """Original BeautifulSoup html.parser path"""
+        soup = BeautifulSoup(html, 'html.parser')
+        listings = []
+        for job_elem in soup.find_all(self.container_tags, class_=self.container_re)[:self.limit]:
+            title_elem = job_elem.find(self.title_tags, class_=self.title_re)
+            if not title_elem:
+                continue
+            link_elem = job_elem.find('a', href=True) or title_elem if title_elem.name == 'a' else None
+            href = link_elem.get('href') if link_elem else None
+            listings.append((title_elem.get_text(strip=True), href))
+        return listings
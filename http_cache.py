@@ -0,0 +1,138 @@
+"""
+On-disk HTTP response cache for hospital career pages
+Sends conditional GETs (ETag / Last-Modified) and remembers the jobs parsed
+from each body, so an unchanged page is neither downloaded nor re-parsed
+"""
+
+import hashlib, threading, time
+import requests
+from requests.structures import CaseInsensitiveDict
+from agent_state import state_path, load_json, save_json, write_atomic
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+CACHE_DIR = "http_cache"
+CACHE_TTL = 24 * 3600         # Force a full download + parse at least daily
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+def _key(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """Conditional-GET cache with TTL and size-bounded LRU eviction"""
+
+    def __init__(self, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = load_json(f"{CACHE_DIR}/index.json", {})
+        self.stats = {"hits_304": 0, "hits_same_hash": 0, "misses": 0, "bytes_saved": 0}
+
+    def _body_path(self, url):
+        return state_path(CACHE_DIR, _key(url) + ".body")
+
+    def _valid_entry(self, url):
+        entry = self._entries.get(url)
+        if not entry or time.time() - entry["stored_at"] > self.ttl:
+            return None
+        if not self._body_path(url).exists():
+            return None
+        return entry
+
+    def _cached_response(self, url, entry):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = self._body_path(url).read_bytes()
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response.encoding = entry.get("encoding")
+        return response
+
+    def fetch(self, session, url, headers=None, timeout=10):
+        """
+        GET url through the cache.
+        Returns (response, unchanged) - unchanged is True when the server
+        answered 304 or sent back a body identical to the cached one.
+        """
+        with self._lock:
+            entry = self._valid_entry(url)
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, headers=request_headers, timeout=timeout)
+
+        with self._lock:
+            if response.status_code == 304 and entry:
+                entry["last_used"] = time.time()
+                self.stats["hits_304"] += 1
+                self.stats["bytes_saved"] += entry["size"]
+                return self._cached_response(url, entry), True
+
+            if response.status_code != 200:
+                return response, False
+
+            digest = hashlib.sha256(response.content).hexdigest()
+            unchanged = entry is not None and entry["sha256"] == digest
+            if unchanged:
+                self.stats["hits_same_hash"] += 1
+            else:
+                self.stats["misses"] += 1
+                write_atomic(self._body_path(url), response.content)
+
+            now = time.time()
+            self._entries[url] = {
+                "etag": response.headers.get("ETag", ""),
+                "last_modified": response.headers.get("Last-Modified", ""),
+                "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+                "encoding": response.encoding,
+                "sha256": digest,
+                "size": len(response.content),
+                "stored_at": now,
+                "last_used": now,
+                # Parsed jobs only survive while the body they came from does
+                "jobs": entry.get("jobs") if unchanged else None,
+            }
+            return response, unchanged
+
+    def jobs_for(self, url):
+        """Jobs previously parsed from the cached body, or None"""
+        with self._lock:
+            entry = self._entries.get(url)
+            return entry.get("jobs") if entry else None
+
+    def remember_jobs(self, url, jobs):
+        """Store the jobs parsed from the body just cached for url"""
+        with self._lock:
+            if url in self._entries:
+                self._entries[url]["jobs"] = jobs
+
+    def save(self):
+        """Evict expired / least recently used entries and write the index"""
+        with self._lock:
+            now = time.time()
+            for url in [url for url, entry in self._entries.items() if now - entry["last_used"] > self.ttl]:
+                self._evict(url)
+            total = sum(entry["size"] for entry in self._entries.values())
+            for url in sorted(self._entries, key=lambda url: self._entries[url]["last_used"]):
+                if total <= self.max_bytes:
+                    break
+                total -= self._entries[url]["size"]
+                self._evict(url)
+            save_json(f"{CACHE_DIR}/index.json", self._entries)
+
+    def _evict(self, url):
+        self._entries.pop(url, None)
+        try:
+            self._body_path(url).unlink()
+        except FileNotFoundError:
+            pass
+
+    def print_stats(self):
+        stats = self.stats
+        print(f"\nResponse cache: {stats['hits_304']} not modified, {stats['hits_same_hash']} unchanged body, "
+              f"{stats['misses']} downloaded+parsed, {stats['bytes_saved'] / 1024:.0f} KB not downloaded")
@@ -0,0 +1,108 @@
+"""
+Shared HTTP session for the direct scrapers
+Keep-alive connection pools per host, gzip/brotli negotiation, retries
+with jittered backoff on transient 429/5xx responses and per-host rate limits
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from rate_limiter import get_scheduler, retry_after_seconds
+
+try:
+    import brotli  # noqa: F401 - lets requests decode 'br' responses
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+POOL_HOSTS = 32        # Number of per-host connection pools kept alive
+POOL_SIZE = 8          # Keep-alive connections per host
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5    # 0.5s, 1s, 2s ...
+RETRY_JITTER = 0.5     # + up to 0.5s random so retries do not line up
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_lock = threading.Lock()
+
+class ScheduledAdapter(HTTPAdapter):
+    """HTTPAdapter that sends every request through the per-host rate limiter"""
+
+    def send(self, request, **kwargs):
+        with get_scheduler().slot(request.url) as outcome:
+            response = super().send(request, **kwargs)
+            retries = getattr(response.raw, "retries", None)
+            history = retries.history if retries is not None else ()
+            if response.status_code == 429:
+                outcome["throttled"] = True
+                outcome["retry_after"] = retry_after_seconds(response.headers.get("Retry-After"))
+            elif any(attempt.status == 429 for attempt in history):
+                # urllib3 already waited out the Retry-After - just slow down
+                outcome["throttled"] = True
+                outcome["retry_after"] = 0
+        return response
+
+def _build_session():
+    retry = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        backoff_jitter=RETRY_JITTER,
+        status_forcelist=RETRY_STATUSES,
+        # Workday's job search is a read-only POST, so retrying it is safe
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # Hand the final response back to the scraper
+    )
+    adapter = ScheduledAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+    return session
+
+def get_session():
+    """The process-wide session shared by every scraper"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+def connection_stats():
+    """
+    Per-host connection reuse: {host: {'requests', 'connections', 'reused'}}.
+    Read from the live urllib3 pools, so retries count as requests.
+    """
+    if _session is None:
+        return {}
+    stats = {}
+    for adapter in {id(a): a for a in _session.adapters.values()}.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = pool.host
+            entry = stats.setdefault(host, {"requests": 0, "connections": 0, "reused": 0})
+            entry["requests"] += pool.num_requests
+            entry["connections"] += pool.num_connections
+            entry["reused"] = entry["requests"] - entry["connections"]
+    return stats
+
+def print_connection_stats():
+    """Print how many connections the shared session saved"""
+    stats = connection_stats()
+    if not stats:
+        return
+    total_requests = sum(entry["requests"] for entry in stats.values())
+    total_connections = sum(entry["connections"] for entry in stats.values())
+    print(f"\nHTTP session: {total_requests} requests over {total_connections} connections "
+          f"({total_requests - total_connections} reused)")
+    for host, entry in sorted(stats.items()):
+        print(f"  {host}: {entry['requests']} requests, {entry['connections']} connections, {entry['reused']} reused")
@@ -0,0 +1,100 @@
+"""
+Job record schema
+One typed record every scraper emits and one column schema every sink uses,
+with compact dtypes for the DataFrame stage
+"""
+
+import pandas as pd
+
+# Record field -> sheet column, in sheet order
+FIELDS = (
+    "title", "platform", "company", "description", "location", "work_model", "published",
+    "salary", "seniority", "company_size", "industry", "apply_link", "source", "collected_at", "uid",
+)
+COLUMNS = (
+    "Job Title", "Platform", "Company Name", "Description", "Location", "Work Model", "Published",
+    "Salary", "Seniority", "Company Size", "Industry", "Apply Link", "Source", "Collected At", "_uid",
+)
+FIELD_COLUMNS = dict(zip(FIELDS, COLUMNS))
+# Few distinct values (or always empty) - one small code per row instead of a string
+CATEGORY_COLUMNS = ("Platform", "Work Model", "Seniority", "Company Size", "Industry", "Source")
+DATE_COLUMNS = ("Published",)
+TIMESTAMP_COLUMNS = ("Collected At",)
+# Columns of the LinkedIn agents' sheet, in their order
+COMPACT_COLUMNS = ["Job Title", "Company Name", "Location", "Apply Link", "Source", "Collected At", "Description", "_uid"]
+
+class JobRecord:
+    """One job posting as emitted by a scraper"""
+
+    __slots__ = FIELDS
+
+    def __init__(self, title, company, location, apply_link, source, platform=None, description="",
+                 published="", salary="", collected_at="", industry="Healthcare",
+                 work_model="", seniority="", company_size="", uid=""):
+        self.title = title
+        self.platform = platform or company
+        self.company = company
+        self.description = description
+        self.location = location
+        self.work_model = work_model
+        self.published = published
+        self.salary = salary
+        self.seniority = seniority
+        self.company_size = company_size
+        self.industry = industry
+        self.apply_link = apply_link
+        self.source = source
+        self.collected_at = collected_at
+        self.uid = uid
+
+    def __repr__(self):
+        return f"JobRecord({self.title!r}, {self.company!r}, {self.apply_link!r})"
+
+    def to_dict(self):
+        """Sheet row keyed by column name"""
+        return {column: getattr(self, field) for field, column in FIELD_COLUMNS.items()}
+
+    @classmethod
+    def from_dict(cls, row):
+        """Record from a sheet row dict (e.g. jobs kept in the response cache)"""
+        return cls(**{field: row.get(column, "") for field, column in FIELD_COLUMNS.items()})
+
+    def restamped(self, collected_at):
+        """Copy collected at another time (Published follows Collected At for direct sources)"""
+        record = JobRecord.from_dict(self.to_dict())
+        record.collected_at = collected_at
+        record.published = collected_at.split("T")[0]
+        return record
+
+def apply_schema(df):
+    """Cast a sheet-column DataFrame to the compact dtypes (in place, returned)"""
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+    for column in TIMESTAMP_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce", utc=True)
+    return df
+
+def records_frame(records):
+    """DataFrame in COLUMNS order built column by column from JobRecords"""
+    df = pd.DataFrame({column: [getattr(record, field) for record in records]
+                       for field, column in FIELD_COLUMNS.items()})
+    return apply_schema(df)
+
+def sheet_frame(df):
+    """Back to the sheet's plain text values: 'YYYY-MM-DD' dates and ISO timestamps"""
+    df = df.copy()
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object)
+    for column in DATE_COLUMNS:
+        if column in df.columns and pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].dt.strftime("%Y-%m-%d")
+    for column in TIMESTAMP_COLUMNS:
+        if column in df.columns and pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].map(lambda ts: ts.isoformat(timespec="seconds"), na_action="ignore")
+    return df
@@ -0,0 +1,164 @@
+"""
+Local job store
+SQLite (WAL) system of record for agent.py, keyed by UID with typed columns,
+first/last-seen times and a platform job ID index. Merge, retention and
+"is new" checks are indexed queries; the Google Sheet only receives view().
+"""
+
+import sqlite3, time
+import pandas as pd
+from agent_state import state_path
+from job_record import FIELD_COLUMNS
+from near_duplicates import ALTERNATE_LINKS_COLUMN
+from url_canon import job_keys
+
+RETENTION_DAYS = 7  # Same window the sheet always kept
+NEW_MARK = "🔥 "    # Prefix older sheets put on new titles; stripped when seeding, never stored
+
+# Store column -> sheet column (uid -> _uid, collected_at stored as epoch seconds)
+STORE_COLUMNS = dict(FIELD_COLUMNS, alternate_links=ALTERNATE_LINKS_COLUMN)
+VIEW_COLUMNS = list(FIELD_COLUMNS.values()) + [ALTERNATE_LINKS_COLUMN, "is_new"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    uid TEXT PRIMARY KEY,
+    title TEXT, platform TEXT, company TEXT, description TEXT, location TEXT,
+    work_model TEXT, published TEXT, salary TEXT, seniority TEXT, company_size TEXT,
+    industry TEXT, apply_link TEXT, source TEXT, alternate_links TEXT,
+    collected_at REAL NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_collected_at ON jobs (collected_at);
+CREATE INDEX IF NOT EXISTS jobs_apply_link ON jobs (apply_link);
+CREATE TABLE IF NOT EXISTS job_keys (
+    job_key TEXT PRIMARY KEY,
+    uid TEXT NOT NULL REFERENCES jobs (uid) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS job_keys_uid ON job_keys (uid);
+"""
+
+def _epoch(values):
+    """Epoch seconds for ISO strings / timestamps (NaN where unparseable)"""
+    stamps = pd.to_datetime(pd.Series(values), errors="coerce", utc=True)
+    return ((stamps - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)).tolist()
+
+def _text(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+class JobStore:
+    """Jobs of the last RETENTION_DAYS in .agent_state/jobs.sqlite3"""
+
+    def __init__(self, path=None):
+        self.path = path or state_path("jobs.sqlite3")
+        self._db = sqlite3.connect(str(self.path))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def _insert(self, df, seen_at):
+        """Insert rows of a sheet-column frame whose UID is not stored yet"""
+        collected = _epoch(df["Collected At"]) if "Collected At" in df.columns else [seen_at] * len(df)
+        fields = list(STORE_COLUMNS)
+        # Column by column, like the rest of the frame stages - no per-row Series
+        values = [[_text(value) for value in df[column].tolist()] if column in df.columns else [""] * len(df)
+                  for column in STORE_COLUMNS.values()]
+        title = fields.index("title")
+        values[title] = [text.removeprefix(NEW_MARK) for text in values[title]]
+        stamps = [seen_at if stamp != stamp else stamp for stamp in collected]
+        rows = [list(row) + [stamp, seen_at, seen_at] for row, stamp in zip(zip(*values), stamps)]
+        columns = ", ".join(fields + ["collected_at", "first_seen", "last_seen"])
+        marks = ", ".join("?" * (len(fields) + 3))
+        self._db.executemany(f"INSERT OR IGNORE INTO jobs ({columns}) VALUES ({marks})", rows)
+        links = df["Apply Link"].tolist()
+        alternates = df[ALTERNATE_LINKS_COLUMN].tolist() if ALTERNATE_LINKS_COLUMN in df.columns else [""] * len(df)
+        self._db.executemany(
+            "INSERT OR IGNORE INTO job_keys (job_key, uid) VALUES (?, ?)",
+            [(key, uid) for uid, link, other in zip(df["_uid"].tolist(), links, alternates)
+             for key in job_keys([link, other])],
+        )
+
+    def bootstrap(self, df):
+        """Seed an empty store from the rows the sheet holds (first run, or lost state)"""
+        df = df[df["_uid"].astype(str).str.strip() != ""]
+        self._insert(df.drop_duplicates(subset=["_uid"]), time.time())
+        return len(df)
+
+    def merge(self, df, run_at):
+        """
+        Record this run's rows. Returns df without the rows already stored
+        under another link (a platform job ID of its Apply Link or Alternate
+        Links, so a copy folded by near_duplicates in an earlier run still
+        matches), with an 'is_new' column. Stored rows that were seen again
+        get last_seen = run_at, and the keys of a matching row's other links.
+        """
+        db = self._db
+        db.execute("CREATE TEMP TABLE IF NOT EXISTS incoming (position INTEGER PRIMARY KEY, uid TEXT)")
+        db.execute("CREATE TEMP TABLE IF NOT EXISTS incoming_keys (position INTEGER, job_key TEXT)")
+        db.execute("DELETE FROM incoming")
+        db.execute("DELETE FROM incoming_keys")
+        uids = df["_uid"].tolist()
+        links = df["Apply Link"].tolist()
+        alternates = df[ALTERNATE_LINKS_COLUMN].tolist() if ALTERNATE_LINKS_COLUMN in df.columns else [""] * len(df)
+        db.executemany("INSERT INTO incoming VALUES (?, ?)", list(enumerate(uids)))
+        db.executemany("INSERT INTO incoming_keys VALUES (?, ?)",
+                       [(position, key) for position, (link, other) in enumerate(zip(links, alternates))
+                        for key in job_keys([link, other])])
+        known_uid = {row[0] for row in db.execute(
+            "SELECT i.position FROM incoming i JOIN jobs j ON j.uid = i.uid")}
+        matches = db.execute("""SELECT i.position, k.uid FROM incoming_keys i
+                                JOIN job_keys k ON k.job_key = i.job_key""").fetchall()
+        known_key = {position for position, _ in matches}
+        db.execute("UPDATE jobs SET last_seen = ? WHERE uid IN (SELECT uid FROM incoming)", (run_at,))
+        db.execute("""UPDATE jobs SET last_seen = ? WHERE uid IN
+                      (SELECT k.uid FROM incoming_keys i JOIN job_keys k ON k.job_key = i.job_key)""", (run_at,))
+        # The stored row also answers to the other copies' keys from now on
+        db.executemany("INSERT OR IGNORE INTO job_keys (job_key, uid) SELECT job_key, ? FROM incoming_keys WHERE position = ?",
+                       [(uid, position) for position, uid in matches if position not in known_uid])
+
+        keep = [position in known_uid or position not in known_key for position in range(len(df))]
+        df = df[keep].copy()
+        # bool dtype even when every row was dropped - an empty object column would select columns below
+        df["is_new"] = pd.Series([position not in known_uid for position, kept in enumerate(keep) if kept],
+                                 index=df.index, dtype=bool)
+        self._insert(df[df["is_new"]], run_at)
+        return df
+
+    def prune(self, days=RETENTION_DAYS):
+        """Drop jobs collected more than days ago; returns how many"""
+        cutoff = time.time() - days * 86400
+        return self._db.execute("DELETE FROM jobs WHERE collected_at < ?", (cutoff,)).rowcount
+
+    def remove_links(self, links):
+        """Drop jobs whose Apply Link is one of links (postings taken down)"""
+        return self._db.executemany("DELETE FROM jobs WHERE apply_link = ?", [(link,) for link in links]).rowcount
+
+    def view(self, run_at):
+        """Every stored job as sheet rows, newest first; is_new marks rows first seen at run_at"""
+        fields = [field for field in STORE_COLUMNS if field != "collected_at"]
+        rows = self._db.execute(
+            f"SELECT {', '.join(fields)}, collected_at, first_seen = ? FROM jobs ORDER BY collected_at DESC, rowid",
+            (run_at,),
+        ).fetchall()
+        df = pd.DataFrame(rows, columns=[STORE_COLUMNS[field] for field in fields] + ["Collected At", "is_new"])
+        df["Collected At"] = pd.to_datetime(df["Collected At"], unit="s", utc=True).map(
+            lambda ts: ts.isoformat(timespec="seconds"), na_action="ignore")
+        df["is_new"] = df["is_new"].astype(bool)
+        return df[VIEW_COLUMNS]
+
+    def commit(self):
+        """Make this run's changes durable - call once the sheet shows them"""
+        self._db.commit()
+
+    def close(self):
+        """Close; anything not committed is rolled back"""
+        self._db.close()
@@ -0,0 +1,31 @@
+"""
+Job UIDs for deduplication
+md5 of the lowercased, stripped Job Title | Company Name | Location | Apply Link,
+built for a whole DataFrame column-wise in one batch instead of row by row
+"""
+
+import hashlib
+import pandas as pd
+
+UID_COLUMNS = ("Job Title", "Company Name", "Location", "Apply Link")
+# The same four fields in a raw scrape_jobs DataFrame
+JOBSPY_UID_COLUMNS = ("title", "company", "location", "job_url")
+
+def uid_for(row) -> str:
+    """UID of a single job (dict or DataFrame row)"""
+    # A dict without a field counts as "", a DataFrame row without the column as None
+    default = "" if isinstance(row, dict) else None
+    key = "|".join(str(row.get(column, default)).strip().lower() for column in UID_COLUMNS)
+    return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+def uids_for(df, columns=UID_COLUMNS):
+    """UID of every row of df - identical to df.apply(uid_for, axis=1)"""
+    # Pull each key column out once and build + hash all keys in one pass;
+    # no per-row Series objects and no per-row branching
+    values = [df[column].tolist() if column in df.columns else [None] * len(df) for column in columns]
+    md5 = hashlib.md5
+    uids = [
+        md5("|".join([str(value).strip().lower() for value in row]).encode("utf-8")).hexdigest()
+        for row in zip(*values)
+    ]
+    return pd.Series(uids, index=df.index, dtype=object)
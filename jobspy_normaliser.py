@@ -0,0 +1,79 @@
+"""
+JobSpy result normaliser
+Turns a raw scrape_jobs DataFrame into sheet rows with column-wise operations
+and a single run timestamp - shared by all three agents
+"""
+
+from datetime import datetime, timezone
+import pandas as pd
+from job_uids import uids_for
+from job_record import COLUMNS, apply_schema
+from url_canon import canonical_links
+
+INTERVAL_LABELS = {
+    "yearly": "per year", "monthly": "per month", "weekly": "per week",
+    "daily": "per day", "hourly": "per hour",
+}
+DESCRIPTION_CHARS = 500
+
+def now_iso():
+    return datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
+
+def _column(jobs, name):
+    """A JobSpy column, or all-missing if this scrape did not return it"""
+    if name in jobs.columns:
+        return jobs[name]
+    return pd.Series(None, index=jobs.index, dtype=object)
+
+def _amount(values):
+    # String dtype so missing amounts stay missing through the concatenations below
+    return values.map("{:,.0f}".format, na_action="ignore").astype("string")
+
+def salary_text(jobs):
+    """'AED 12,000-15,000 per month' from min/max_amount, currency and interval; '' without an amount"""
+    low = pd.to_numeric(_column(jobs, 'min_amount'), errors='coerce')
+    high = pd.to_numeric(_column(jobs, 'max_amount'), errors='coerce')
+    low_text, high_text = _amount(low), _amount(high)
+    # Range when both ends are known and differ, otherwise whichever end exists
+    amount = (low_text + "-" + high_text).where(low.notna() & high.notna() & (low != high), low_text)
+    amount = amount.fillna(high_text)
+    currency = _column(jobs, 'currency').fillna('').astype("string")
+    interval = _column(jobs, 'interval').map(INTERVAL_LABELS).fillna('')
+    text = ((currency + " " + amount).str.strip() + " " + interval).str.strip()
+    return text.where(amount.notna(), '').astype(object)
+
+def normalise_jobs(jobs, source_label="JobSpy", collected_at=None, description_chars=DESCRIPTION_CHARS):
+    """
+    Sheet rows (job_record.COLUMNS with its compact dtypes, _uid included)
+    for a raw scrape_jobs DataFrame.
+
+    source_label: Source column is '<Platform> (<source_label>)', e.g. 'Linkedin (15-min)'
+    collected_at: run timestamp shared by every row (default: now)
+    description_chars: truncate descriptions, or None to keep them whole
+    """
+    if jobs.empty:
+        return pd.DataFrame(columns=list(COLUMNS))
+    collected_at = collected_at or now_iso()
+    platform = _column(jobs, 'site').str.capitalize()
+    description = _column(jobs, 'description')
+    if description_chars is not None and description.notna().any():
+        description = description.str[:description_chars]
+
+    df = pd.DataFrame({
+        'Job Title': jobs['title'],
+        'Platform': platform,
+        'Company Name': _column(jobs, 'company'),
+        'Description': description,
+        'Location': _column(jobs, 'location'),
+        'Work Model': '',
+        'Published': pd.to_datetime(_column(jobs, 'date_posted'), errors='coerce').dt.strftime('%Y-%m-%d'),
+        'Salary': salary_text(jobs),
+        'Seniority': '',
+        'Company Size': '',
+        'Industry': 'Healthcare',
+        'Apply Link': canonical_links(jobs['job_url']),
+        'Source': platform + f" ({source_label})",
+        'Collected At': collected_at,
+    }, index=jobs.index)
+    df['_uid'] = uids_for(df)
+    return apply_schema(df)
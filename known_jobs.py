@@ -0,0 +1,48 @@
+"""
+Known JobSpy postings
+UIDs of postings earlier runs already handled, so paginated searches can stop
+as soon as they only return postings we already hold
+"""
+
+import re, threading, time
+from agent_state import load_json, save_json
+from job_uids import uids_for, JOBSPY_UID_COLUMNS
+from url_canon import canonical_links
+
+KNOWN_DAYS = 7  # Same as the sheet retention - older postings are gone anyway
+
+def jobspy_uids(df):
+    """UIDs for every row of a raw scrape_jobs DataFrame - the same uid_for() gives its sheet row"""
+    if "job_url" in df.columns:
+        df = df.assign(job_url=canonical_links(df["job_url"]))
+    return uids_for(df, JOBSPY_UID_COLUMNS)
+
+class KnownJobs:
+    """Set of already handled UIDs for one agent, persisted in .agent_state"""
+
+    def __init__(self, agent):
+        self.file = "known_jobs/" + re.sub(r'[^A-Za-z0-9_.-]', '_', agent) + ".json"
+        self._uids = load_json(self.file, {})
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._uids)
+
+    def all_known(self, uids):
+        """True if every UID (at least one) is already known"""
+        uids = list(uids)
+        with self._lock:
+            return bool(uids) and all(uid in self._uids for uid in uids)
+
+    def remember(self, uids):
+        """Mark UIDs as handled by this run"""
+        now = time.time()
+        with self._lock:
+            self._uids.update((uid, now) for uid in uids if uid)
+
+    def save(self):
+        """Persist - call only once the results are safely in the sheet"""
+        cutoff = time.time() - KNOWN_DAYS * 86400
+        with self._lock:
+            self._uids = {uid: ts for uid, ts in self._uids.items() if ts >= cutoff}
+            save_json(self.file, self._uids)
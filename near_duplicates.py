@@ -0,0 +1,168 @@
+"""
+Cross-platform near-duplicate detection
+The same posting scraped from LinkedIn, Indeed and the hospital's own site has
+different links and slightly different titles, so its UIDs differ. MinHash
+signatures of the normalised title + company are bucketed with LSH, candidate
+pairs are verified on their shingle sets and locations, and each cluster
+collapses to one canonical row that keeps the other copies' links.
+"""
+
+import re, zlib
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+SHINGLE_CHARS = 4
+NUM_PERM = 64
+BANDS = 16          # 16 bands x 4 rows: pairs above ~0.5 similarity usually share a bucket
+SIMILARITY = 0.7    # Jaccard of the shingle sets needed to call two postings the same
+MAX_BUCKET = 200    # Larger buckets are generic titles ("Nurse") - too weak to pair on
+ALTERNATE_LINKS_COLUMN = "Alternate Links"
+# Which copy stays: the employer's own posting first, then LinkedIn, then Indeed
+PLATFORM_PRIORITY = {"linkedin": 1, "indeed": 2}
+
+# Words that differ between boards without changing the job
+TITLE_NOISE = {"urgent", "urgently", "hiring", "required", "requirement", "vacancy", "job", "jobs",
+               "opening", "immediate", "joiner", "joiners", "new", "apply", "now", "uae", "dubai"}
+COMPANY_NOISE = {"llc", "l", "fz", "fze", "fzllc", "co", "company", "ltd", "limited", "inc",
+                 "group", "the", "uae", "dubai", "abu", "dhabi"}
+# Emirate / city names in a Location -> place; a Location naming none ("UAE", "") fits any place
+PLACES = {"dubai": "dubai", "abu dhabi": "abu dhabi", "al ain": "al ain", "sharjah": "sharjah",
+          "ajman": "ajman", "umm al quwain": "umm al quwain", "ras al khaimah": "ras al khaimah",
+          "rak": "ras al khaimah", "fujairah": "fujairah"}
+TITLE_SYNONYMS = {"rn": "registered nurse", "sr": "senior", "jr": "junior", "icu": "intensive care",
+                  "er": "emergency", "ed": "emergency", "ot": "operating theatre"}
+
+_P = (1 << 31) - 1
+_rng = np.random.default_rng(20240901)  # Fixed seed: identical signatures every run
+_A = _rng.integers(1, _P, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _P, NUM_PERM, dtype=np.uint64)
+
+def _words(text, noise, synonyms=None):
+    words = re.sub(r"[^a-z0-9]+", " ", str(text).lower()).split()
+    if synonyms:
+        words = " ".join(synonyms.get(word, word) for word in words).split()
+    return [word for word in words if word not in noise]
+
+def posting_key(title, company):
+    """Normalised 'title | company' the shingles are taken from"""
+    if company is None or (isinstance(company, float) and np.isnan(company)):
+        company = ""
+    title = " ".join(_words(str(title).replace("🔥", ""), TITLE_NOISE, TITLE_SYNONYMS))
+    return title + " | " + " ".join(_words(company, COMPANY_NOISE))
+
+def location_places(location):
+    """Set of PLACES named in a Location (empty when it names none)"""
+    if location is None or (isinstance(location, float) and np.isnan(location)):
+        return frozenset()
+    text = " " + " ".join(re.sub(r"[^a-z0-9]+", " ", str(location).lower()).split()) + " "
+    return frozenset(place for name, place in PLACES.items() if f" {name} " in text)
+
+def _same_place(a, b):
+    """Two postings can be one job unless both name places and none is shared"""
+    return not a or not b or bool(a & b)
+
+def shingles(key, k=SHINGLE_CHARS):
+    """Set of k-character shingles (stable crc32 hashes)"""
+    if len(key) <= k:
+        return {zlib.crc32(key.encode("utf-8"))}
+    return {zlib.crc32(key[i:i + k].encode("utf-8")) for i in range(len(key) - k + 1)}
+
+def minhash(hashes):
+    """NUM_PERM-value MinHash signature of a shingle hash set"""
+    values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes)) % _P
+    return ((_A[:, None] * values[None, :] + _B[:, None]) % _P).min(axis=1)
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+def _priority(platform):
+    return PLATFORM_PRIORITY.get(str(platform).lower(), 0)
+
+# ============================================================================
+# CLUSTERING
+# ============================================================================
+def find_clusters(df, similarity=SIMILARITY, bands=BANDS):
+    """
+    Groups of row positions in df that are the same posting on different
+    platforms. Linear in the number of rows apart from the (small) buckets;
+    two rows from the same platform are never merged - a board lists each
+    posting once, so those are different jobs - and neither are rows whose
+    Locations name different emirates/cities.
+    """
+    rows_per_band = NUM_PERM // bands
+    sets = [shingles(posting_key(title, company))
+            for title, company in zip(df["Job Title"].tolist(), df["Company Name"].tolist())]
+    platforms = [str(platform).lower() for platform in df["Platform"].tolist()]
+    places = ([location_places(location) for location in df["Location"].tolist()]
+              if "Location" in df.columns else [frozenset()] * len(sets))
+
+    buckets = {}
+    for position, shingle_set in enumerate(sets):
+        signature = minhash(shingle_set)
+        for band in range(bands):
+            key = (band, signature[band * rows_per_band:(band + 1) * rows_per_band].tobytes())
+            buckets.setdefault(key, []).append(position)
+
+    pairs = {}
+    for members in buckets.values():
+        if len(members) < 2 or len(members) > MAX_BUCKET:
+            continue
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                if (platforms[first] != platforms[second] and (first, second) not in pairs
+                        and _same_place(places[first], places[second])):
+                    pairs[(first, second)] = _jaccard(sets[first], sets[second])
+
+    # Most similar pairs first; merge two clusters only if they share no platform
+    # and every member's location fits every other's (no Dubai row joining via a "UAE" row
+    # a cluster that already holds a Sharjah row)
+    cluster_of = list(range(len(sets)))
+    clusters = {position: [position] for position in range(len(sets))}
+    for (first, second), score in sorted(pairs.items(), key=lambda item: -item[1]):
+        if score < similarity:
+            break
+        a, b = cluster_of[first], cluster_of[second]
+        if a == b or {platforms[p] for p in clusters[a]} & {platforms[p] for p in clusters[b]}:
+            continue
+        if not all(_same_place(places[p], places[q]) for p in clusters[a] for q in clusters[b]):
+            continue
+        for position in clusters[b]:
+            cluster_of[position] = a
+        clusters[a].extend(clusters.pop(b))
+    return [sorted(members) for members in clusters.values() if len(members) > 1]
+
+def collapse_near_duplicates(df, similarity=SIMILARITY):
+    """
+    df with each cluster reduced to its canonical row (employer's own site,
+    then LinkedIn, then Indeed; earliest row on ties). The dropped copies'
+    Apply Links go to the canonical row's ALTERNATE_LINKS_COLUMN.
+
+    Returns (df, report) with report keys: rows, duplicates, clusters, rate.
+    """
+    report = {"rows": len(df), "duplicates": 0, "clusters": 0, "rate": 0.0}
+    if df.empty:
+        return df, report
+    df = df.reset_index(drop=True)
+    clusters = find_clusters(df, similarity)
+    alternates = pd.Series("", index=df.index, dtype=object)
+    drop = []
+    platforms = df["Platform"].tolist()
+    links = df["Apply Link"].tolist()
+    for members in clusters:
+        canonical = min(members, key=lambda position: (_priority(platforms[position]), position))
+        others = [position for position in members if position != canonical]
+        alternates[canonical] = " ".join(str(links[position]) for position in others)
+        drop.extend(others)
+
+    df[ALTERNATE_LINKS_COLUMN] = alternates
+    df = df.drop(index=drop).reset_index(drop=True)
+    report.update(duplicates=len(drop), clusters=len(clusters),
+                  rate=len(drop) / report["rows"] if report["rows"] else 0.0)
+    return df, report
+
+def print_duplicate_report(report):
+    print(f"Near-duplicates: {report['duplicates']} of {report['rows']} postings "
+          f"({report['rate']:.1%}) folded into {report['clusters']} canonical rows")
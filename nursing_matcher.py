@@ -0,0 +1,87 @@
+"""
+Nursing relevance matcher
+One compiled, word-bounded alternation classifies a title (and optionally a
+description) against the keyword and exclusion lexicon in a single pass
+"""
+
+import re
+import pandas as pd
+
+# ============================================================================
+# LEXICON
+# ============================================================================
+NURSING_KEYWORDS = [
+    "nurse", "nurses", "nursing",
+    "registered nurse", "staff nurse", "charge nurse", "clinical nurse",
+    "nurse practitioner", "nurse educator", "nurse manager",
+    "rn", "rns", "bsn", "lpn",
+    "midwife", "midwives", "midwifery",
+]
+# Titles that mention nursing but are not nursing roles
+EXCLUSIONS = [
+    "veterinary", "vet nurse", "nursery",
+    "recruiter", "talent acquisition",
+]
+
+def _alternation(terms):
+    # Longest first so "registered nurse" wins over "nurse"
+    terms = sorted({term.lower() for term in terms}, key=len, reverse=True)
+    return "|".join(re.escape(term).replace(r"\ ", r"\s+") for term in terms)
+
+class NursingMatcher:
+    """Word-boundary keyword/exclusion matcher compiled once"""
+
+    def __init__(self, keywords=NURSING_KEYWORDS, exclusions=EXCLUSIONS):
+        self.keywords = list(keywords)
+        self.exclusions = list(exclusions)
+        parts = [f"(?P<keyword>{_alternation(self.keywords)})"]
+        if self.exclusions:
+            parts.insert(0, f"(?P<exclude>{_alternation(self.exclusions)})")
+        self._pattern = re.compile(r"\b(?:" + "|".join(parts) + r")\b", re.I)
+
+    def with_keywords(self, extra):
+        """Matcher with extra keywords added to the lexicon"""
+        if not extra:
+            return self
+        return NursingMatcher(self.keywords + list(extra), self.exclusions)
+
+    def classify(self, title, description=None):
+        """
+        'nursing', 'excluded' or '' for a title. The description is only
+        consulted when the title has no keyword; an exclusion in the title
+        always wins.
+        """
+        verdict = self._scan(title)
+        if verdict == "" and description:
+            verdict = "nursing" if self._scan(description) == "nursing" else ""
+        return verdict
+
+    def matches(self, title, description=None):
+        return self.classify(title, description) == "nursing"
+
+    def _scan(self, text):
+        if not isinstance(text, str) or not text:
+            return ""
+        found = ""
+        for match in self._pattern.finditer(text):
+            if match.lastgroup == "exclude":
+                return "excluded"
+            found = "nursing"
+        return found
+
+    def tag_series(self, titles, descriptions=None):
+        """Vector of 'nursing' / 'excluded' / '' for a whole Series"""
+        titles = pd.Series(titles)
+        if descriptions is None:
+            return titles.map(self._scan).fillna("")
+        descriptions = pd.Series(descriptions, index=titles.index)
+        return pd.Series(
+            [self.classify(title, description) for title, description in zip(titles, descriptions)],
+            index=titles.index,
+        )
+
+    def mask(self, titles, descriptions=None):
+        """Boolean mask of nursing rows for a Series"""
+        return self.tag_series(titles, descriptions) == "nursing"
+
+NURSING = NursingMatcher()
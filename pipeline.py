@@ -0,0 +1,115 @@
+"""
+Streaming stage pipeline
+Each stage runs in its own thread and hands items to the next through a
+bounded queue, so a scraper's results are normalised, filtered and deduped
+while the other scrapers are still running. A full queue blocks the stage
+before it (backpressure) instead of piling frames up in memory.
+"""
+
+import queue, threading, time
+
+QUEUE_SIZE = 8  # Items (one per search / hospital source) waiting between two stages
+
+_DONE = object()
+
+class Stage:
+    """One pipeline step: fn(item) returns the item for the next stage, or None to drop it"""
+
+    def __init__(self, name, fn):
+        self.name = name
+        self.fn = fn
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.busy = 0.0      # Seconds spent in fn
+        self.blocked = 0.0   # Seconds waiting for room in the next queue
+        self.max_depth = 0
+        self._depth_total = 0
+        self.started = None
+        self.finished = None
+
+    def _run(self, inbox, outbox):
+        self.started = time.perf_counter()
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            self.items_in += 1
+            depth = inbox.qsize()
+            self._depth_total += depth
+            self.max_depth = max(self.max_depth, depth)
+            start = time.perf_counter()
+            try:
+                result = self.fn(item)
+            except Exception as e:
+                self.errors += 1
+                result = None
+                print(f"Pipeline stage '{self.name}' failed on an item: {e}")
+            self.busy += time.perf_counter() - start
+            if result is not None and outbox is not None:
+                start = time.perf_counter()
+                outbox.put(result)
+                self.blocked += time.perf_counter() - start
+                self.items_out += 1
+            elif result is not None:
+                self.items_out += 1
+        self.finished = time.perf_counter()
+        if outbox is not None:
+            outbox.put(_DONE)
+
+    def stats(self):
+        lifetime = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        return {
+            "stage": self.name, "in": self.items_in, "out": self.items_out, "errors": self.errors,
+            "busy_seconds": round(self.busy, 3), "blocked_seconds": round(self.blocked, 3),
+            "utilisation": self.busy / lifetime if lifetime > 0 else 0.0,
+            "max_queue": self.max_depth,
+            "avg_queue": self._depth_total / self.items_in if self.items_in else 0.0,
+        }
+
+class Pipeline:
+    """Stages wired by bounded queues; producers put() from any thread, close() drains everything"""
+
+    def __init__(self, stages, queue_size=QUEUE_SIZE):
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in self.stages]
+        self._threads = []
+        self.fed = 0
+        self.feed_blocked = 0.0
+
+    def start(self):
+        for i, stage in enumerate(self.stages):
+            outbox = self._queues[i + 1] if i + 1 < len(self.stages) else None
+            thread = threading.Thread(target=stage._run, args=(self._queues[i], outbox),
+                                      name=f"pipeline-{stage.name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def put(self, item):
+        """Feed the first stage (blocks while its queue is full)"""
+        start = time.perf_counter()
+        self._queues[0].put(item)
+        self.feed_blocked += time.perf_counter() - start
+        self.fed += 1
+
+    def close(self):
+        """No more input - wait until every stage has finished its items"""
+        self._queues[0].put(_DONE)
+        for thread in self._threads:
+            thread.join()
+
+    def report(self):
+        return [stage.stats() for stage in self.stages]
+
+def print_pipeline_report(pipeline):
+    """Print per-stage throughput, time spent and queue depths"""
+    print(f"\nPipeline report (queue size {pipeline.queue_size}, {pipeline.fed} items fed, "
+          f"producers blocked {pipeline.feed_blocked:.2f}s):")
+    for entry in pipeline.report():
+        errors = f"  {entry['errors']} errors" if entry["errors"] else ""
+        print(f"  {entry['stage']:<10} in {entry['in']:>4}  out {entry['out']:>4}  "
+              f"busy {entry['busy_seconds']:>6.2f}s ({entry['utilisation']:.0%})  "
+              f"blocked {entry['blocked_seconds']:>5.2f}s  "
+              f"queue max {entry['max_queue']} avg {entry['avg_queue']:.1f}{errors}")
@@ -0,0 +1,176 @@
+"""
+Per-host token-bucket rate limiter
+Every outgoing request waits for a token and a free in-flight slot of its
+host; hosts that answer 429 / Retry-After are paused and slowed down
+"""
+
+import threading, time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+# rate: tokens per second, burst: bucket size, max_in_flight: concurrent requests
+HOST_LIMITS = {
+    # LinkedIn's guest API blocks bursts quickly
+    "www.linkedin.com": {"rate": 0.5, "burst": 3, "max_in_flight": 2},
+    "apis.indeed.com": {"rate": 1.0, "burst": 4, "max_in_flight": 4},
+    "boards-api.greenhouse.io": {"rate": 5.0, "burst": 10, "max_in_flight": 4},
+}
+DEFAULT_LIMIT = {"rate": 5.0, "burst": 10, "max_in_flight": 4}
+THROTTLE_PAUSE = 30      # Seconds a host is paused after a 429 without Retry-After
+MAX_PAUSE = 120
+MIN_RATE_FACTOR = 0.125  # A throttled host never drops below 1/8 of its rate
+RECOVERY_STEP = 0.1      # Each clean request gives back 10% of the configured rate
+
+def retry_after_seconds(value):
+    """Retry-After header (seconds or HTTP date) -> seconds, or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class HostLimiter:
+    """Token bucket plus in-flight cap for one host"""
+
+    def __init__(self, rate, burst, max_in_flight):
+        self.base_rate = self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, cost=1):
+        """Block until the host has a free slot and cost tokens; returns the wait"""
+        cost = min(cost, self.burst)
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                elif self.in_flight >= self.max_in_flight:
+                    delay = None  # Woken by release()
+                elif self.tokens < cost:
+                    delay = (cost - self.tokens) / self.rate
+                else:
+                    break
+                self._cond.wait(delay)
+            self.tokens -= cost
+            self.in_flight += 1
+            waited = time.monotonic() - start
+            self.requests += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        return waited
+
+    def release(self, throttled=False, retry_after=None):
+        """Free the slot; a throttled response pauses the host and halves its rate"""
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self._throttle(retry_after)
+            else:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_STEP)
+            self._cond.notify_all()
+
+    def penalize(self, retry_after=None):
+        """Throttle signal seen outside acquire/release (e.g. in JobSpy's log)"""
+        with self._cond:
+            self._throttle(retry_after)
+            self._cond.notify_all()
+
+    def _throttle(self, retry_after):
+        pause = min(retry_after if retry_after is not None else THROTTLE_PAUSE, MAX_PAUSE)
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+        self.rate = max(self.base_rate * MIN_RATE_FACTOR, self.rate / 2)
+        self.tokens = 0
+        self.throttled += 1
+
+class CrawlScheduler:
+    """Host-aware gate shared by the JobSpy searches and the hospital fetches"""
+
+    def __init__(self, limits=None):
+        self.limits = dict(HOST_LIMITS, **(limits or {}))
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def host(self, url_or_host):
+        host = urlparse(url_or_host).netloc or url_or_host
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = HostLimiter(**self.limits.get(host, DEFAULT_LIMIT))
+            return self._hosts[host]
+
+    @contextmanager
+    def slot(self, url_or_host, cost=1):
+        """
+        Hold one in-flight slot of the host for the body of the with block.
+        Set outcome['throttled'] (and 'retry_after') on a 429 to slow it down.
+        """
+        limiter = self.host(url_or_host)
+        limiter.acquire(cost)
+        outcome = {"throttled": False, "retry_after": None}
+        try:
+            yield outcome
+        finally:
+            limiter.release(outcome["throttled"], outcome["retry_after"])
+
+    def penalize(self, url_or_host, retry_after=None):
+        self.host(url_or_host).penalize(retry_after)
+
+    def stats(self):
+        """{host: {'requests', 'wait_total', 'wait_max', 'throttled', 'rate'}}"""
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {
+            host: {"requests": limiter.requests, "wait_total": limiter.wait_total, "wait_max": limiter.wait_max,
+                   "throttled": limiter.throttled, "rate": limiter.rate}
+            for host, limiter in hosts.items()
+        }
+
+    def print_stats(self):
+        """Print queue wait and throttling per host"""
+        stats = self.stats()
+        if not stats:
+            return
+        print("\nRate limiter (queue wait per host):")
+        for host, entry in sorted(stats.items()):
+            average = entry["wait_total"] / entry["requests"] if entry["requests"] else 0.0
+            line = (f"  {host}: {entry['requests']} requests, waited {entry['wait_total']:.1f}s "
+                    f"(avg {average:.2f}s, max {entry['wait_max']:.1f}s)")
+            if entry["throttled"]:
+                line += f", throttled {entry['throttled']}x, now {entry['rate']:.2f}/s"
+            print(line)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """The process-wide scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = CrawlScheduler()
+    return _scheduler
@@ -0,0 +1,83 @@
+"""
+Run-time budget
+One wall-clock deadline for the scraping stages, with time reserved for the
+sheet sync, and per-source yield history to run the most productive sources first
+"""
+
+import os, threading, time
+from agent_state import load_json, save_json
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+RUN_BUDGET_SECONDS = int(os.getenv("RUN_BUDGET_SECONDS", "900"))
+SHEET_RESERVE_SECONDS = int(os.getenv("SHEET_RESERVE_SECONDS", "120"))  # Always left for the sheet
+YIELD_FILE = "source_yield.json"
+SMOOTHING = 0.3  # Weight of the latest run in the yield averages
+
+class RunBudget:
+    """Deadline for the scraping stages of one run"""
+
+    def __init__(self, total_seconds=RUN_BUDGET_SECONDS, reserve_seconds=SHEET_RESERVE_SECONDS):
+        self.started = time.monotonic()
+        self.total = total_seconds
+        self.reserve = reserve_seconds
+        self.deadline = self.started + total_seconds - reserve_seconds
+        self.deferred = []
+
+    def remaining(self):
+        """Seconds left for scraping before the sheet reserve starts"""
+        return max(0.0, self.deadline - time.monotonic())
+
+    def fits(self, expected_seconds):
+        """Whether work expected to take this long still ends before the deadline"""
+        remaining = self.remaining()
+        return remaining > 0 and expected_seconds <= remaining
+
+    def defer(self, key, reason):
+        self.deferred.append((key, reason))
+
+    def print_report(self):
+        used = time.monotonic() - self.started
+        print(f"\nRun budget: {used:.0f}s used of {self.total}s ({self.reserve}s reserved for the sheet sync)")
+        for key, reason in self.deferred:
+            print(f"  deferred {key}: {reason}")
+
+class YieldHistory:
+    """Smoothed new jobs and seconds per source across runs"""
+
+    def __init__(self, path=YIELD_FILE):
+        self.path = path
+        self.sources = load_json(path, {})
+        self._lock = threading.Lock()
+
+    def rate(self, key):
+        """New jobs per second, or None for a source without history"""
+        entry = self.sources.get(key)
+        if not entry:
+            return None
+        return entry["new_jobs"] / max(entry["seconds"], 0.1)
+
+    def expected_seconds(self, key, default=0.0):
+        entry = self.sources.get(key)
+        return entry["seconds"] if entry else default
+
+    def order(self, keys):
+        """Keys by descending yield; sources without history first, so they get measured"""
+        keys = list(keys)
+        return sorted(keys, key=lambda key: (self.rate(key) is not None, -(self.rate(key) or 0.0)))
+
+    def record(self, key, new_jobs, seconds):
+        with self._lock:
+            entry = self.sources.get(key)
+            if entry is None:
+                self.sources[key] = {"new_jobs": float(new_jobs), "seconds": float(seconds), "runs": 1}
+            else:
+                entry["new_jobs"] += SMOOTHING * (new_jobs - entry["new_jobs"])
+                entry["seconds"] += SMOOTHING * (seconds - entry["seconds"])
+                entry["runs"] += 1
+
+    def save(self):
+        """Persist - call once the sheet holds the new jobs they were counted from"""
+        with self._lock:
+            save_json(self.path, self.sources)
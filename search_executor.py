@@ -0,0 +1,252 @@
+"""
+Concurrent JobSpy search executor
+Runs every (search, site) pair on one thread pool, gated by the per-host rate
+limiter, optionally page by page so a search stops once it only returns known postings
+"""
+
+import logging, math, re, threading, time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from jobspy import scrape_jobs
+from known_jobs import jobspy_uids
+from rate_limiter import get_scheduler
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+MAX_WORKERS = 12  # Per-host limits live in rate_limiter.HOST_LIMITS
+# Host each JobSpy site talks to, and results per HTTP request, so one
+# scrape_jobs call takes as many rate-limiter tokens as requests it makes.
+# Indeed walks its cursor from the start again for an offset.
+SITE_HOSTS = {
+    "linkedin": {"host": "www.linkedin.com", "per_request": 10},
+    "indeed": {"host": "apis.indeed.com", "per_request": 100, "rewalks_offset": True},
+}
+# Results per page when paginating against known jobs. LinkedIn resumes at any
+# offset; Indeed re-walks its cursor, so it only pays off per full API page
+PAGE_SIZE = {"linkedin": 25, "indeed": 100}
+DEFAULT_PAGE_SIZE = 25
+
+def _label(search):
+    return search.get("label", search.get("search_term", ""))
+
+def search_key(search, site):
+    """Key of one (search, site) pair in the yield history"""
+    return f"{site}|{_label(search)}"
+
+class _ThrottleLogHandler(logging.Handler):
+    """
+    JobSpy only logs a 429, a blocked page or an exception and returns what
+    it has - feed throttles to the rate limiter and count every error so the
+    search that hit it is not treated as complete
+    """
+
+    STATUS = re.compile(r"response status code (\d+)")
+
+    def __init__(self, host):
+        super().__init__(logging.ERROR)
+        self.host = host
+        self.errors = 0
+
+    def emit(self, record):
+        self.errors += 1  # handle() already holds the handler's lock
+        match = self.STATUS.search(record.getMessage())
+        # LinkedIn answers 999 when it blocks a client outright
+        if match and match.group(1) in ("429", "999"):
+            get_scheduler().penalize(self.host)
+
+_LOG_HANDLERS = {}
+for _site, _name in (("linkedin", "LinkedIn"), ("indeed", "Indeed")):
+    _LOG_HANDLERS[_site] = _ThrottleLogHandler(SITE_HOSTS[_site]["host"])
+    logging.getLogger(f"JobSpy:{_name}").addHandler(_LOG_HANDLERS[_site])
+
+def _logged_errors(site):
+    """Errors JobSpy has logged for site so far"""
+    handler = _LOG_HANDLERS.get(site)
+    return handler.errors if handler is not None else 0
+
+def _scrape(site, window, **params):
+    """One scrape_jobs call for one site, holding a slot of the site's host"""
+    config = SITE_HOSTS.get(site, {"host": site})
+    cost = 1
+    if "per_request" in config:
+        wanted = params.get("results_wanted", 15)
+        if config.get("rewalks_offset"):
+            wanted += params.get("offset", 0)
+        cost = max(1, math.ceil(wanted / config["per_request"]))
+    with get_scheduler().slot(config["host"], cost):
+        return scrape_jobs(site_name=[site], hours_old=window, **params)
+
+def _scrape_pages(params, site, window, known, budget=None):
+    """
+    Fetch results_wanted in pages, stopping after the first page whose
+    postings are all known, or when the run budget is used up.
+    Returns (pages, pages_fetched, pages_useful, complete, covered):
+    covered is False when paging stopped at an all-known page before the
+    end of the results - they are relevance-ordered, so a new posting may
+    rank below it and the window was not fully read.
+    """
+    wanted = params.pop("results_wanted", 15)
+    page_size = PAGE_SIZE.get(site, DEFAULT_PAGE_SIZE)
+    pages, fetched, useful = [], 0, 0
+    while fetched * page_size < wanted:
+        if fetched and budget is not None and not budget.remaining():
+            return pages, fetched, useful, False, False
+        offset = fetched * page_size
+        size = min(page_size, wanted - offset)
+        page = _scrape(site, window, results_wanted=size, offset=offset, **params)
+        fetched += 1
+        if page.empty:
+            break
+        pages.append(page)
+        if known.all_known(jobspy_uids(page)):
+            return pages, fetched, useful, True, len(page) < size or fetched * page_size >= wanted
+        useful += 1
+        if len(page) < size:
+            break  # End of the results
+    return pages, fetched, useful, True, True
+
+def _scrape_site(search, site, hours_old, watermarks, known, budget=None, expected_seconds=0.0):
+    """Run one search against one site, never raising"""
+    params = {key: value for key, value in search.items() if key != "label"}
+    label = _label(search)
+    window = watermarks.window_hours(label, site) if watermarks else hours_old
+    if budget is not None and not budget.fits(expected_seconds):
+        # Not started: its watermark stays put, so the next run covers this window
+        budget.defer(f"{site} '{label}'", f"needs ~{expected_seconds:.0f}s, {budget.remaining():.0f}s left")
+        return pd.DataFrame(), 0.0, None, window, None, True
+    start = time.perf_counter()
+    started_at = time.time()
+    errors_before = _logged_errors(site)
+    pages = None
+    try:
+        complete = covered = True
+        if known is not None:
+            frames, fetched, useful, complete, covered = _scrape_pages(params, site, window, known, budget)
+            df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+            pages = (fetched, useful)
+        else:
+            df = _scrape(site, window, **params)
+        error = None
+        # JobSpy logs errors in its own threads, so any error on this site while the call
+        # ran counts - at worst a search that was fine keeps its full window for one more run
+        logged = _logged_errors(site) - errors_before
+        if logged:
+            error = f"{site}: JobSpy logged {logged} error(s) (throttled or blocked) - results may be partial"
+            if watermarks:
+                watermarks.mark_failure(label, site)
+        elif watermarks and complete and covered:
+            watermarks.mark_success(label, site, started_at)
+        # Stopped at known postings: the watermark stays put, so the next run's window still
+        # reaches back to the last fully read one
+        if not complete:
+            budget.defer(f"{site} '{label}'", f"stopped after {pages[0]} pages at the deadline")
+    except Exception as e:
+        df = pd.DataFrame()
+        error = f"{site}: {e}"
+        if watermarks:
+            watermarks.mark_failure(label, site)
+    elapsed = time.perf_counter() - start
+    return df, elapsed, error, window, pages, False
+
+def _merge_sites(frames):
+    """Combine per-site frames exactly like a multi-site scrape_jobs call does"""
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values(by=["site", "date_posted"], ascending=[True, False]).reset_index(drop=True)
+
+def _stream_results(searches, sites, futures, on_result):
+    """Call on_result(search, df) once the last site future of each search completes"""
+    remaining = {i: len(sites) for i in range(len(searches))}
+    lock = threading.Lock()
+
+    def site_done(i):
+        with lock:
+            remaining[i] -= 1
+            if remaining[i]:
+                return
+        search = searches[i]
+        on_result(search, _merge_sites([futures[search_key(search, site)].result()[0] for site in sites]))
+
+    for i, search in enumerate(searches):
+        for site in sites:
+            futures[search_key(search, site)].add_done_callback(lambda _future, i=i: site_done(i))
+
+def run_searches(searches, sites, hours_old, max_workers=MAX_WORKERS, watermarks=None, known=None,
+                 budget=None, yields=None, on_result=None):
+    """
+    Run JobSpy searches concurrently; every scrape_jobs call waits for its
+    host in the shared rate limiter (concurrency, tokens, 429 backoff).
+
+    searches: list of dicts with a 'label' plus scrape_jobs keyword arguments
+    hours_old: full search window; with SearchWatermarks each (search, site)
+    only looks back to its last successful run plus a margin
+    known: KnownJobs - fetch results page by page and stop a search at the
+    first page holding only known postings
+    budget / yields: RunBudget and YieldHistory - (search, site) pairs start
+    in order of past new jobs per second, and pairs that would not finish
+    before the deadline are deferred to the next run
+    on_result: called as on_result(search, df) from a worker thread as soon
+    as all sites of a search are done, in completion order
+    Returns (frames, report): one DataFrame per search in the original order
+    (so concatenating them matches the sequential run) and one report dict
+    per search with its timing, result count and errors.
+    """
+    tasks = {search_key(search, site): (i, site) for i, search in enumerate(searches) for site in sites}
+    order = yields.order(tasks) if yields is not None else list(tasks)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for key in order:
+            i, site = tasks[key]
+            expected = yields.expected_seconds(key) if yields is not None else 0.0
+            futures[key] = executor.submit(_scrape_site, searches[i], site, hours_old, watermarks, known,
+                                           budget, expected)
+        if on_result is not None:
+            _stream_results(searches, sites, futures, on_result)
+
+        frames = []
+        report = []
+        for search in searches:
+            results = [futures[search_key(search, site)].result() for site in sites]
+            df = _merge_sites([result[0] for result in results])
+            frames.append(df)
+            report.append({
+                "label": _label(search),
+                "results": len(df),
+                "seconds": max((result[1] for result in results), default=0.0),
+                "site_seconds": {site: result[1] for site, result in zip(sites, results)},
+                "errors": [result[2] for result in results if result[2]],
+                "site_hours": {site: result[3] for site, result in zip(sites, results)},
+                "site_pages": {site: result[4] for site, result in zip(sites, results) if result[4]},
+                "deferred": [site for site, result in zip(sites, results) if result[5]],
+            })
+
+    return frames, report
+
+def print_search_report(report):
+    """Print per-search timing and result counts"""
+    print("\nJobSpy search report:")
+    for i, entry in enumerate(report, 1):
+        sites = ", ".join(f"{site} {seconds:.1f}s/{entry['site_hours'][site]}h"
+                          + (f" {entry['site_pages'][site][1]}/{entry['site_pages'][site][0]}p"
+                             if site in entry["site_pages"] else "")
+                          for site, seconds in entry["site_seconds"].items())
+        if len(entry["deferred"]) == len(entry["site_seconds"]):
+            status = "DEFERRED"
+        elif not entry["errors"]:
+            status = "ok"
+        elif len(entry["errors"]) < len(entry["site_seconds"]):
+            status = "PARTIAL"
+        else:
+            status = "FAILED"
+        print(f"  [{i}/{len(report)}] {entry['label']}: {entry['results']} jobs in {entry['seconds']:.1f}s ({sites}) {status}")
+        for error in entry["errors"]:
+            print(f"      error: {error}")
+    paged = [pages for entry in report for pages in entry["site_pages"].values()]
+    if paged:
+        fetched = sum(pages[0] for pages in paged)
+        useful = sum(pages[1] for pages in paged)
+        print(f"  Pages: {useful}/{fetched} useful ({fetched - useful} fetched only to find known postings)")
@@ -0,0 +1,49 @@
+"""
+Per-query search watermarks
+Each (search, site) remembers when it last ran successfully, so the next run
+only asks JobSpy for postings since then plus a safety margin
+"""
+
+import math, re, threading, time
+from agent_state import load_json, save_json
+
+MARGIN_HOURS = 1  # Overlap with the previous window (late-indexed postings)
+MIN_WINDOW_HOURS = 1
+
+class SearchWatermarks:
+    """Last-success watermarks for one agent's searches"""
+
+    def __init__(self, agent, full_window_hours, margin_hours=MARGIN_HOURS):
+        self.file = "watermarks/" + re.sub(r'[^A-Za-z0-9_.-]', '_', agent) + ".json"
+        self.full_window = full_window_hours
+        self.margin = margin_hours
+        self._marks = load_json(self.file, {})
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(label, site):
+        return f"{site}|{label}"
+
+    def window_hours(self, label, site):
+        """hours_old for this search: since the watermark, or the full window"""
+        with self._lock:
+            mark = self._marks.get(self._key(label, site))
+        if not mark or mark.get("last_success") is None:
+            return self.full_window
+        elapsed = (time.time() - mark["last_success"]) / 3600 + self.margin
+        return max(MIN_WINDOW_HOURS, min(self.full_window, math.ceil(elapsed)))
+
+    def mark_success(self, label, site, started_at):
+        """Search covered everything published up to started_at"""
+        with self._lock:
+            self._marks[self._key(label, site)] = {"last_success": started_at}
+
+    def mark_failure(self, label, site):
+        """Next run falls back to the full window for this search"""
+        with self._lock:
+            self._marks[self._key(label, site)] = {"last_success": None}
+
+    def save(self):
+        """Persist - call only once the results are safely in the sheet"""
+        with self._lock:
+            save_json(self.file, self._marks)
@@ -0,0 +1,146 @@
+"""
+Batched sheet formatting
+Collects formatting requests and sends them as one spreadsheets.batchUpdate
+instead of one HTTP round trip per range. The sheet's styling itself is
+conditional-format rules on a hidden row-type column, set up once per layout
+version (SheetLayout).
+"""
+
+import json
+from gspread.utils import rowcol_to_a1
+from agent_state import load_json, save_json
+
+class FormatBatch:
+    """Queue of formatting requests for one worksheet, applied in order by apply()"""
+
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+        self.requests = []
+        self.bytes = 0
+
+    def extend(self, requests):
+        """Queue batchUpdate requests; nothing is sent until apply()"""
+        self.requests.extend(requests)
+
+    def apply(self, spreadsheet):
+        """Send everything queued in one batchUpdate; returns the number of requests"""
+        if not self.requests:
+            return 0
+        body = {"requests": self.requests}
+        self.bytes = len(json.dumps(body).encode("utf-8"))
+        spreadsheet.batch_update(body)
+        return len(self.requests)
+
+# ============================================================================
+# SHEET LAYOUT - conditional-format rules, set up once per layout version
+# ============================================================================
+# Bump when the rules or base formats below change
+LAYOUT_VERSION = 1
+LAYOUT_FILE = "sheet_format.json"
+ROW_TYPE_COLUMN = "_row_type"
+NEW_COLUMN = "is_new"
+HIDDEN_COLUMNS = (ROW_TYPE_COLUMN, NEW_COLUMN)
+
+WHITE = {"red": 1.0, "green": 1.0, "blue": 1.0}
+BLACK = {"red": 0.0, "green": 0.0, "blue": 0.0}
+# row type -> (columns: 'summary_left' A:B, 'summary_right' C:D or 'row', background, white bold text)
+ROW_STYLES = [
+    ("summary_title", "summary_left", {"red": 0.2, "green": 0.4, "blue": 0.8}, True),
+    ("summary_title", "summary_right", {"red": 0.2, "green": 0.7, "blue": 0.3}, True),
+    ("summary_header", "summary_left", {"red": 0.7, "green": 0.8, "blue": 1.0}, False),
+    ("summary_header", "summary_right", {"red": 0.7, "green": 0.9, "blue": 0.7}, False),
+    ("summary_total", "summary_left", None, False),
+    (ROW_TYPE_COLUMN, "row", {"red": 0.27, "green": 0.45, "blue": 0.77}, True),  # Header row: the column's name
+    ("month", "row", {"red": 0.0, "green": 0.7, "blue": 0.0}, True),   # Dark Green
+    ("day", "row", {"red": 0.3, "green": 0.6, "blue": 1.0}, True),     # Light Blue
+]
+NEW_JOB_BACKGROUND = {"red": 1.0, "green": 0.9, "blue": 0.7}  # Jobs this run added
+
+def _column_letter(index):
+    """'A' for column index 0"""
+    return rowcol_to_a1(1, index + 1).rstrip("0123456789")
+
+def _rule(sheet_id, start_column, end_column, formula, background, white_bold):
+    cell_format = {"textFormat": {"bold": True}}
+    if background is not None:
+        cell_format["backgroundColor"] = background
+    if white_bold:
+        cell_format["textFormat"]["foregroundColor"] = WHITE
+    return {"addConditionalFormatRule": {"index": 0, "rule": {
+        "ranges": [{"sheetId": sheet_id, "startRowIndex": 0,
+                    "startColumnIndex": start_column, "endColumnIndex": end_column}],
+        "booleanRule": {"condition": {"type": "CUSTOM_FORMULA", "values": [{"userEnteredValue": formula}]},
+                        "format": cell_format},
+    }}}
+
+def layout_requests(sheet_id, columns, header_row, existing_rules=0):
+    """
+    One-time setup: plain base format for the whole sheet, one conditional
+    rule per row style keyed on the hidden row-type column (and is_new),
+    frozen header, hidden helper columns, fitted widths
+    """
+    width = len(columns)
+    row_type = "$" + _column_letter(columns.index(ROW_TYPE_COLUMN))
+    spans = {"summary_left": (0, 2), "summary_right": (2, 4), "row": (0, width)}
+    requests = [{"deleteConditionalFormatRule": {"sheetId": sheet_id, "index": 0}} for _ in range(existing_rules)]
+    requests.append({"repeatCell": {
+        "range": {"sheetId": sheet_id, "startRowIndex": 0, "startColumnIndex": 0, "endColumnIndex": width},
+        "cell": {"userEnteredFormat": {
+            "backgroundColor": WHITE, "wrapStrategy": "WRAP", "verticalAlignment": "TOP",
+            "textFormat": {"bold": False, "fontSize": 10, "fontFamily": "Arial", "foregroundColor": BLACK},
+        }},
+        "fields": "userEnteredFormat(backgroundColor,wrapStrategy,verticalAlignment,textFormat)",
+    }})
+    # Row types are exclusive, so rule order does not matter; the is_new rule only matches job rows
+    if NEW_COLUMN in columns:
+        is_new = "$" + _column_letter(columns.index(NEW_COLUMN))
+        requests.append(_rule(sheet_id, 0, width, f"={is_new}1=TRUE", NEW_JOB_BACKGROUND, False))
+    for name, span, background, white_bold in ROW_STYLES:
+        start, end = spans[span]
+        requests.append(_rule(sheet_id, start, end, f'={row_type}1="{name}"', background, white_bold))
+    requests.append({"updateSheetProperties": {
+        "properties": {"sheetId": sheet_id, "gridProperties": {"frozenRowCount": header_row}},
+        "fields": "gridProperties.frozenRowCount",
+    }})
+    requests.append({"autoResizeDimensions": {"dimensions": {
+        "sheetId": sheet_id, "dimension": "COLUMNS", "startIndex": 0, "endIndex": width}}})
+    for name in HIDDEN_COLUMNS:
+        if name in columns:
+            index = columns.index(name)
+            requests.append({"updateDimensionProperties": {
+                "range": {"sheetId": sheet_id, "dimension": "COLUMNS", "startIndex": index, "endIndex": index + 1},
+                "properties": {"hiddenByUser": True}, "fields": "hiddenByUser",
+            }})
+    return requests
+
+class SheetLayout:
+    """Sets up the rules when the layout marker (version, columns, header row) changed; else no API calls"""
+
+    def __init__(self, spreadsheet, worksheet):
+        self.spreadsheet = spreadsheet
+        self.worksheet = worksheet
+        self._marker = None
+        self.api_calls = 0
+        self.bytes = 0
+
+    def ensure(self, columns, header_row):
+        """Returns True if the layout had to be (re)applied"""
+        marker = {"sheet": [self.spreadsheet.id, self.worksheet.id], "version": LAYOUT_VERSION,
+                  "columns": list(columns), "header_row": header_row}
+        if load_json(LAYOUT_FILE, None) == marker:
+            return False
+        # Rules from an earlier layout are replaced, not stacked
+        metadata = self.spreadsheet.fetch_sheet_metadata({"fields": "sheets(properties(sheetId),conditionalFormats)"})
+        existing = next((len(sheet.get("conditionalFormats", [])) for sheet in metadata.get("sheets", [])
+                         if sheet["properties"]["sheetId"] == self.worksheet.id), 0)
+        batch = FormatBatch(self.worksheet)
+        batch.extend(layout_requests(self.worksheet.id, list(columns), header_row, existing))
+        batch.apply(self.spreadsheet)
+        self.api_calls, self.bytes = 2, batch.bytes
+        self._marker = marker
+        return True
+
+    def save(self):
+        """Record the applied layout - once the whole sheet update went through"""
+        if self._marker is not None:
+            save_json(LAYOUT_FILE, self._marker)
@@ -0,0 +1,85 @@
+"""
+Lightweight sheet existence index
+Reads only the UID, timestamp and link columns of a sheet with one ranged
+batch_get (or page by page), instead of get_all_values() downloading every
+title and description just to learn which jobs are already there
+"""
+
+from gspread.utils import rowcol_to_a1
+from url_canon import JobKeyIndex
+
+INDEX_COLUMNS = ("_uid", "Collected At", "Apply Link")
+PAGE_ROWS = 0  # 0 = all rows in one request; otherwise rows per request
+
+def _column_letter(index):
+    """'A' for column index 0"""
+    return rowcol_to_a1(1, index + 1).rstrip("0123456789")
+
+class SheetIndex:
+    """
+    UIDs, Collected At per UID and platform job keys of the job rows in a
+    worksheet whose header is on header_row (rows without a UID, such as
+    separators, are skipped)
+    """
+
+    def __init__(self, worksheet, header_row=1, page_rows=PAGE_ROWS, columns=INDEX_COLUMNS):
+        self.worksheet = worksheet
+        self.header_row = header_row
+        self.page_rows = page_rows
+        self.columns = columns
+        self.uids = set()
+        self.collected_at = {}
+        self.keys = JobKeyIndex()
+        self.rows = 0        # Rows below the header, separators included
+        self.api_calls = 0
+        self.cells = 0
+
+    def _pages(self, letters):
+        """Lists of column values (one list per column), page by page"""
+        first = self.header_row + 1
+        # A page ending on separator rows comes back short (trailing empty cells are
+        # trimmed), so paging runs to the grid's last row rather than to a short page
+        last_row = self.worksheet.row_count
+        while first <= last_row:
+            last = f"{first + self.page_rows - 1}" if self.page_rows else ""
+            ranges = [f"{letter}{first}:{letter}{last}" for letter in letters]
+            self.api_calls += 1
+            columns = [value_range[0] if value_range else []
+                       for value_range in self.worksheet.batch_get(ranges, major_dimension="COLUMNS")]
+            height = max((len(column) for column in columns), default=0)
+            if height:
+                # Trailing empty cells are trimmed per column - pad back to one height
+                yield [column + [""] * (height - len(column)) for column in columns]
+            if not self.page_rows:
+                return
+            first += self.page_rows
+
+    def load(self):
+        """Read the index columns; a sheet without a _uid header gives an empty index. Returns self."""
+        self.api_calls += 1
+        header = self.worksheet.row_values(self.header_row)
+        if self.columns[0] not in header:
+            return self
+        present = [name for name in self.columns if name in header]
+        letters = [_column_letter(header.index(name)) for name in present]
+        for page in self._pages(letters):
+            values = dict(zip(present, page))
+            uids = values[self.columns[0]]
+            self.rows += len(uids)
+            self.cells += sum(len(column) for column in page)
+            stamps = values.get("Collected At", [""] * len(uids))
+            for uid, stamp in zip(uids, stamps):
+                uid = uid.strip()
+                if uid:
+                    self.uids.add(uid)
+                    self.collected_at[uid] = stamp
+            if "Apply Link" in values:
+                self.keys.add(link for uid, link in zip(uids, values["Apply Link"]) if uid.strip())
+        return self
+
+    def __len__(self):
+        return len(self.uids)
+
+    def print_report(self):
+        print(f"Sheet index: {len(self.uids)} jobs in {self.rows} rows - {self.cells} cells "
+              f"of {len(self.columns)} columns in {self.api_calls} API calls")
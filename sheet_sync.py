@@ -0,0 +1,131 @@
+"""
+Incremental Google Sheet sync
+Diffs the rows to write against the layout written last run (row key + content
+hash per row) and applies only the difference: deleteDimension for rows that
+went away, insertDimension + values for new rows, values for changed rows.
+Falls back to the old clear-and-rewrite when there is no usable layout.
+"""
+
+import hashlib, json
+from agent_state import load_json, save_json
+
+LAYOUT_FILE = "sheet_layout.json"
+
+def row_hash(row):
+    return hashlib.md5("\x1f".join(str(value) for value in row).encode("utf-8")).hexdigest()[:16]
+
+def row_keys(rows, uid_column="_uid"):
+    """
+    Stable key per row: the job's UID, the label of a separator row, or the
+    position for the rows above the header (summary table and blanks)
+    """
+    header = next((i for i, row in enumerate(rows) if uid_column in row), None)
+    if header is None:
+        return [f"top|{i}" for i in range(len(rows))]
+    uid_index = rows[header].index(uid_column)
+    keys = [f"top|{i}" for i in range(header)] + ["header"]
+    for row in rows[header + 1:]:
+        uid = row[uid_index] if len(row) > uid_index else ""
+        keys.append(uid if uid else "sep|" + str(row[0] if row else ""))
+    return keys
+
+def _runs(indices):
+    """Contiguous (start, end) runs of sorted row indices"""
+    runs = []
+    for index in indices:
+        if runs and runs[-1][1] == index:
+            runs[-1][1] = index + 1
+        else:
+            runs.append([index, index + 1])
+    return runs
+
+class SheetSync:
+    """Writes rows to one worksheet as a row-level diff against the last written layout"""
+
+    def __init__(self, spreadsheet, worksheet):
+        self.spreadsheet = spreadsheet
+        self.worksheet = worksheet
+        layout = load_json(LAYOUT_FILE, {})
+        same_sheet = layout.get("sheet") == [spreadsheet.id, worksheet.id]
+        self._old = list(zip(layout.get("keys", []), layout.get("hashes", []))) if same_sheet else None
+        self._new = None
+        self.stats = {"mode": "", "api_calls": 0, "bytes": 0, "inserted": 0, "deleted": 0, "updated": 0}
+
+    def _range(self, start):
+        title = self.worksheet.title.replace("'", "''")
+        return f"'{title}'!A{start + 1}"
+
+    def _call(self, fn, body):
+        self.stats["api_calls"] += 1
+        self.stats["bytes"] += len(json.dumps(body, ensure_ascii=False).encode("utf-8"))
+        return fn(body)
+
+    def plan(self, rows):
+        """
+        (structure_requests, value_ranges) that turn the last written layout
+        into rows, or None if only a full rewrite can (no layout, reordered rows)
+        """
+        if not self._old:
+            return None
+        keys = row_keys(rows)
+        hashes = [row_hash(row) for row in rows]
+        if len(set(keys)) != len(keys):
+            return None
+        new_keys = set(keys)
+        old_keys = {key: digest for key, digest in self._old}
+        kept_old = [key for key, _ in self._old if key in new_keys]
+        kept_new = [key for key in keys if key in old_keys]
+        if kept_old != kept_new:
+            return None
+
+        sheet_id = self.worksheet.id
+        requests = []
+        # Deletes bottom-up so earlier indices stay valid
+        deleted = [i for i, (key, _) in enumerate(self._old) if key not in new_keys]
+        for start, end in reversed(_runs(deleted)):
+            requests.append({"deleteDimension": {"range": {
+                "sheetId": sheet_id, "dimension": "ROWS", "startIndex": start, "endIndex": end}}})
+        # Inserts top-down at their final positions
+        inserted = [i for i, key in enumerate(keys) if key not in old_keys]
+        for start, end in _runs(inserted):
+            requests.append({"insertDimension": {"range": {
+                "sheetId": sheet_id, "dimension": "ROWS", "startIndex": start, "endIndex": end},
+                "inheritFromBefore": start > 0}})
+        changed = [i for i, key in enumerate(keys) if key in old_keys and old_keys[key] != hashes[i]]
+        # Padded to the full width so a shorter row clears what a longer one left behind
+        width = max(len(row) for row in rows)
+        value_ranges = [{"range": self._range(start), "values": [row + [""] * (width - len(row)) for row in rows[start:end]]}
+                        for start, end in _runs(sorted(inserted + changed))]
+
+        self.stats.update(deleted=len(deleted), inserted=len(inserted), updated=len(changed))
+        self._new = (keys, hashes)
+        return requests, value_ranges
+
+    def sync(self, rows, full=False):
+        """Write rows (list of lists starting at A1)"""
+        planned = None if full else self.plan(rows)
+        if planned is None:
+            self.stats.update(mode="full rewrite", inserted=len(rows), deleted=0, updated=0)
+            self.stats["api_calls"] += 1
+            self.worksheet.clear()
+            self._call(lambda body: self.worksheet.update(body, "A1"), rows)
+            self._new = (row_keys(rows), [row_hash(row) for row in rows])
+            return
+        requests, value_ranges = planned
+        self.stats["mode"] = "incremental"
+        if requests:
+            self._call(self.spreadsheet.batch_update, {"requests": requests})
+        if value_ranges:
+            self._call(self.spreadsheet.values_batch_update, {"valueInputOption": "RAW", "data": value_ranges})
+
+    def save(self):
+        """Remember the written layout - only once the whole sheet update went through"""
+        if self._new is not None:
+            keys, hashes = self._new
+            save_json(LAYOUT_FILE, {"sheet": [self.spreadsheet.id, self.worksheet.id],
+                                    "keys": keys, "hashes": hashes})
+
+    def print_report(self):
+        stats = self.stats
+        print(f"Sheet sync ({stats['mode']}): +{stats['inserted']} rows, -{stats['deleted']} rows, "
+              f"{stats['updated']} changed - {stats['api_calls']} API calls, {stats['bytes'] / 1024:.1f} KB sent")
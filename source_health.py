@@ -0,0 +1,96 @@
+"""
+Per-source health history and circuit breaker
+Sources that keep failing or finding nothing are skipped with exponential
+backoff and only probed again once their backoff has passed
+"""
+
+import time
+from agent_state import load_json, save_json
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+HEALTH_FILE = "source_health.json"
+FAILURE_THRESHOLD = 3      # Consecutive bad runs before the circuit opens
+BASE_BACKOFF_HOURS = 2     # First open period, doubled on every failed probe
+MAX_BACKOFF_HOURS = 7 * 24
+HISTORY_RUNS = 20          # Runs kept per source
+BAD_STATUSES = ("error", "timeout", "cancelled")
+
+def _new_record():
+    return {"state": "closed", "open_until": 0, "trips": 0, "bad_streak": 0,
+            "runs": 0, "errors": 0, "zero_yield": 0, "jobs": 0, "avg_seconds": None, "history": []}
+
+class SourceHealth:
+    """
+    Health records keyed by source name.
+
+    closed: source runs every time. open: skipped until open_until.
+    half_open: backoff passed - the next run is a single probe that closes
+    the circuit on success or re-opens it for twice as long.
+    """
+
+    def __init__(self, path=HEALTH_FILE, threshold=FAILURE_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.records = load_json(path, {})
+
+    def _record(self, name):
+        return self.records.setdefault(name, _new_record())
+
+    def allow(self, name, now=None):
+        """Whether this run should fetch the source"""
+        record = self._record(name)
+        now = now or time.time()
+        if record["state"] == "open" and now >= record["open_until"]:
+            record["state"] = "half_open"
+        return record["state"] != "open"
+
+    def skipped_entry(self, name):
+        """Engine report entry for a source with an open circuit"""
+        until = time.strftime("%Y-%m-%d %H:%M", time.localtime(self._record(name)["open_until"]))
+        return {"name": name, "jobs": [], "seconds": 0.0, "status": "skipped", "error": f"circuit open until {until}"}
+
+    def record(self, entry, zero_yield_ok=False, now=None):
+        """Update a source's health from its engine report entry"""
+        record = self._record(entry["name"])
+        now = now or time.time()
+        jobs = len(entry["jobs"])
+        failed = entry["status"] in BAD_STATUSES
+        empty = not failed and jobs == 0 and not zero_yield_ok
+
+        record["runs"] += 1
+        record["errors"] += failed
+        record["zero_yield"] += empty
+        record["jobs"] += jobs
+        seconds = entry["seconds"]
+        record["avg_seconds"] = seconds if record["avg_seconds"] is None else 0.7 * record["avg_seconds"] + 0.3 * seconds
+        record["history"] = (record["history"] + [[int(now), entry["status"], jobs, round(seconds, 2)]])[-HISTORY_RUNS:]
+
+        if failed or empty:
+            record["bad_streak"] += 1
+            if record["state"] == "half_open" or record["bad_streak"] >= self.threshold:
+                # Failed probe or too many bad runs in a row - back off
+                backoff = min(BASE_BACKOFF_HOURS * 2 ** record["trips"], MAX_BACKOFF_HOURS)
+                record["trips"] += 1
+                record["state"] = "open"
+                record["open_until"] = now + backoff * 3600
+        else:
+            record.update(state="closed", open_until=0, trips=0, bad_streak=0)
+
+    def save(self):
+        save_json(self.path, self.records)
+
+    def print_report(self, names=None):
+        """Print circuit state, yield and latency per source"""
+        names = names or list(self.records)
+        print("\nSource health (circuit breaker):")
+        for name in names:
+            record = self._record(name)
+            state = record["state"].replace("_", "-")
+            if record["state"] == "open":
+                state += " until " + time.strftime("%Y-%m-%d %H:%M", time.localtime(record["open_until"]))
+            runs = record["runs"] or 1
+            latency = f"{record['avg_seconds']:.1f}s" if record["avg_seconds"] is not None else "-"
+            print(f"  {name}: {state} | {record['jobs'] / runs:.1f} jobs/run, avg {latency}, "
+                  f"{record['errors']} errors, {record['zero_yield']} empty in {record['runs']} runs")
@@ -0,0 +1,17 @@
+import agent_state
+from http_cache import ResponseCache
+from hospital_engine import run_hospital_sources
+
+def test_fetch_source_bypasses_response_cache(tmp_path, monkeypatch):
+    # Workday / Greenhouse sources return plain data from their own fetch, not a Response
+    monkeypatch.setattr(agent_state, "STATE_DIR", tmp_path)
+    postings = [{"title": "Staff Nurse"}]
+    source = {
+        "name": "Workday tenant",
+        "url": "https://example.wd3.myworkdayjobs.com/wday/cxs/t/s/jobs",
+        "fetch": lambda timeout: postings,
+        "parse": lambda fetched: [posting["title"] for posting in fetched],
+    }
+    jobs, report = run_hospital_sources([source], cache=ResponseCache())
+    assert report[0]["status"] == "ok", report[0]["error"]
+    assert jobs == ["Staff Nurse"]
@@ -0,0 +1,20 @@
+import pandas as pd
+from job_store import JobStore
+
+LINKEDIN = "https://www.linkedin.com/jobs/view/3912345678"
+WORKDAY = "https://mediclinic.wd3.myworkdayjobs.com/External/job/Dubai/Staff-Nurse_JR-1234"
+
+def _row(uid, platform, link, alternates=""):
+    return {"_uid": uid, "Job Title": "Staff Nurse", "Platform": platform, "Company Name": "Mediclinic",
+            "Location": "Dubai", "Apply Link": link, "Alternate Links": alternates}
+
+def test_copy_folded_in_a_later_run_matches_the_stored_row(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    store.merge(pd.DataFrame([_row("li", "LinkedIn", LINKEDIN)]), 1.0)
+    # Next run: near_duplicates made the hospital copy canonical, the LinkedIn link is an alternate
+    merged = store.merge(pd.DataFrame([_row("md", "Mediclinic", WORKDAY, LINKEDIN)]), 2.0)
+    assert merged.empty
+    assert store.view(2.0)["_uid"].tolist() == ["li"]
+    # The stored row now also answers to the hospital link on its own
+    assert store.merge(pd.DataFrame([_row("md", "Mediclinic", WORKDAY)]), 3.0).empty
+    assert len(store) == 1
@@ -0,0 +1,19 @@
+import pandas as pd
+from near_duplicates import collapse_near_duplicates
+
+def _frame(platforms, locations):
+    return pd.DataFrame({
+        "Job Title": ["Staff Nurse"] * len(platforms),
+        "Company Name": ["NMC Healthcare"] * len(platforms),
+        "Platform": platforms,
+        "Location": locations,
+        "Apply Link": [f"https://example.com/{i}" for i in range(len(platforms))],
+    })
+
+def test_same_title_in_different_emirates_is_kept():
+    df, report = collapse_near_duplicates(_frame(["LinkedIn", "Indeed"], ["Dubai, United Arab Emirates", "Sharjah, AE"]))
+    assert len(df) == 2 and report["duplicates"] == 0
+
+def test_same_emirate_is_folded():
+    df, report = collapse_near_duplicates(_frame(["LinkedIn", "Indeed"], ["Dubai, United Arab Emirates", "Dubai"]))
+    assert len(df) == 1 and df.loc[0, "Alternate Links"] == "https://example.com/1"
@@ -0,0 +1,30 @@
+import pandas as pd
+import agent_state
+import search_executor
+from known_jobs import KnownJobs, jobspy_uids
+from search_watermarks import SearchWatermarks
+
+SEARCH = {"label": "ICU nurse", "search_term": "icu nurse", "results_wanted": 50}
+
+def _page(start, count):
+    return pd.DataFrame({"job_url": [f"https://www.linkedin.com/jobs/view/{100000 + i}" for i in range(start, start + count)],
+                         "title": ["ICU Nurse"] * count, "company": ["Hospital"] * count,
+                         "site": ["linkedin"] * count, "date_posted": ["2026-01-01"] * count})
+
+def _run(monkeypatch, tmp_path, known_pages):
+    monkeypatch.setattr(agent_state, "STATE_DIR", tmp_path)
+    # Stands in for one scrape_jobs call (the rate limiter is not under test)
+    monkeypatch.setattr(search_executor, "_scrape",
+                        lambda site, window, results_wanted, offset, **params: _page(offset, results_wanted))
+    known = KnownJobs("test")
+    known.remember(jobspy_uids(pd.concat([_page(page * 25, 25) for page in known_pages])))
+    watermarks = SearchWatermarks("test", 24)
+    search_executor.run_searches([SEARCH], ["linkedin"], 24, watermarks=watermarks, known=known)
+    return watermarks.window_hours(SEARCH["label"], "linkedin")
+
+def test_stopping_at_a_known_page_keeps_the_watermark(tmp_path, monkeypatch):
+    # Page 1 all known, page 2 never read - a new posting may rank there
+    assert _run(monkeypatch, tmp_path, known_pages=[0]) == 24
+
+def test_reading_every_page_advances_the_watermark(tmp_path, monkeypatch):
+    assert _run(monkeypatch, tmp_path, known_pages=[1]) < 24
@@ -0,0 +1,32 @@
+from gspread.utils import a1_to_rowcol
+from sheet_index import SheetIndex
+
+class FakeWorksheet:
+    """Answers ranged COLUMNS reads like the Sheets API: trailing empty cells trimmed"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.row_count = len(rows) + 5  # Grids keep spare empty rows
+
+    def row_values(self, row):
+        return self.rows[row - 1]
+
+    def batch_get(self, ranges, major_dimension):
+        result = []
+        for a1 in ranges:
+            start, end = a1.split(":")
+            first, column = a1_to_rowcol(start)
+            last = int(end.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ") or len(self.rows))
+            values = [row[column - 1] if column <= len(row) else "" for row in self.rows[first - 1:last]]
+            while values and values[-1] == "":
+                values.pop()
+            result.append([values] if values else [])
+        return result
+
+def test_pages_ending_on_separator_rows_do_not_stop_the_index():
+    rows = [["Job Title", "_uid", "Collected At", "Apply Link"]]
+    for i in range(10):
+        rows.append(["--- Today ---", "", "", ""] if i in (3, 4) else ["Nurse", f"u{i}", "2026-01-01", f"https://example.com/{i}"])
+    expected = {f"u{i}" for i in range(10) if i not in (3, 4)}
+    for page_rows in (0, 5, 3):
+        assert SheetIndex(FakeWorksheet(rows), page_rows=page_rows).load().uids == expected
@@ -0,0 +1,25 @@
+import agent_state
+import workday
+
+def _run(monkeypatch, postings):
+    def fetch_page(url, search_text, offset, timeout):
+        return {"total": len(postings), "jobPostings": postings[offset:offset + workday.PAGE_SIZE]}
+    monkeypatch.setattr(workday, "_fetch_page", fetch_page)
+    fetched = workday.fetch_postings("example.wd3.myworkdayjobs.com", "tenant", "site")
+    workday.accept_postings("example.wd3.myworkdayjobs.com", "tenant", "site")
+    workday.commit_seen_state()
+    return {workday.posting_id(posting) for posting in fetched}
+
+def test_new_posting_on_a_later_page_is_fetched(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_state, "STATE_DIR", tmp_path)
+    postings = [{"externalPath": f"/job/{i}", "title": "Nurse"} for i in range(45)]
+    assert len(_run(monkeypatch, postings)) == 45
+    # Relevance order: the new posting ranks on page 2, page 1 is all seen
+    postings.insert(25, {"externalPath": "/job/new", "title": "Nurse"})
+    assert "/job/new" in _run(monkeypatch, postings)
+
+def test_unchanged_total_stops_at_seen_postings(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_state, "STATE_DIR", tmp_path)
+    postings = [{"externalPath": f"/job/{i}", "title": "Nurse"} for i in range(45)]
+    _run(monkeypatch, postings)
+    assert len(_run(monkeypatch, postings)) == workday.PAGE_SIZE
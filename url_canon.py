@@ -0,0 +1,124 @@
+"""
+Apply link canonicalisation
+Strips tracking parameters, locale paths and scheme/host variations from job
+links and extracts the stable platform job ID (LinkedIn, Indeed, Greenhouse,
+Workday), so one posting is recognised whatever link it was scraped under
+"""
+
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+TRACKING_PARAMS = {"trk", "trkinfo", "refid", "trackingid", "lipi", "position", "pagenum", "ebp",
+                   "from", "src", "source", "ref", "gh_src", "tk", "advn", "adid", "fccid", "vjs",
+                   "gclid", "fbclid", "mc_cid", "mc_eid"}
+TRACKING_PREFIXES = ("utm_",)
+LOCALE_PATH = re.compile(r"^/[a-z]{2}(?:-[A-Za-z]{2})?(?=/)")
+
+_LINKEDIN_VIEW = re.compile(r"/jobs/view/(?:[^/]*?-)?(\d{6,})")
+_GREENHOUSE_PATH = re.compile(r"/([^/]+)/jobs/(\d+)")
+_WORKDAY_REQ = re.compile(r"/job/(?:.*/)?[^/]*_([A-Za-z0-9-]+)$")
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def canonical_url(url):
+    """
+    https, lowercase host, no tracking parameters, fragment, locale path or
+    trailing slash; LinkedIn links become their plain view URL. The host is
+    kept otherwise (ae.indeed.com stays the UAE site) - job_key() is what
+    matches one posting across hosts.
+    """
+    url = str(url or "").strip()
+    if not url:
+        return ""
+    key = job_key(url)
+    if key and key.startswith("linkedin:"):
+        return "https://www.linkedin.com/jobs/view/" + key.split(":", 1)[1]
+    parts = urlsplit(url if "//" in url else "https://" + url)
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not _is_tracking(name))
+    path = parts.path.rstrip("/") or "/"
+    if "myworkdayjobs.com" in parts.netloc.lower():
+        path = LOCALE_PATH.sub("", path)
+    return urlunsplit(("https", parts.netloc.lower(), path, urlencode(query), ""))
+
+def canonical_links(links):
+    """canonical_url() of every link, as a list"""
+    return [canonical_url(link) if isinstance(link, str) else link for link in links]
+
+def job_key(url):
+    """
+    'platform:job-id' for links whose platform ID is known, else None.
+    Generic career-page links get no key: several postings can share one.
+    """
+    url = str(url or "").strip()
+    if not url:
+        return None
+    parts = urlsplit(url if "//" in url else "https://" + url)
+    host = parts.netloc.lower()
+    query = {name.lower(): value for name, value in parse_qsl(parts.query)}
+
+    if host.endswith("linkedin.com"):
+        # Country subdomains (ae.linkedin.com) and ?currentJobId= all point at /jobs/view/<id>
+        match = _LINKEDIN_VIEW.search(parts.path)
+        job_id = match.group(1) if match else query.get("currentjobid")
+        return f"linkedin:{job_id}" if job_id else None
+    if "indeed." in host:
+        job_id = query.get("jk") or query.get("vjk")
+        return f"indeed:{job_id.lower()}" if job_id else None
+    if "greenhouse.io" in host:
+        match = _GREENHOUSE_PATH.search(parts.path)
+        if match:
+            return f"greenhouse:{match.group(2)}"
+    if query.get("gh_jid"):
+        # Greenhouse boards embedded on the employer's own domain
+        return f"greenhouse:{query['gh_jid']}"
+    if "myworkdayjobs.com" in host:
+        path = LOCALE_PATH.sub("", parts.path.rstrip("/"))
+        match = _WORKDAY_REQ.search(path)
+        if match:
+            tenant = host.split(".")[0]
+            return f"workday:{tenant}:{match.group(1).lower()}"
+    return None
+
+def job_keys(links):
+    """job_key() of every link; an 'Alternate Links' cell holds several, space separated"""
+    return [key for cell in links for link in str(cell or "").split() if (key := job_key(link))]
+
+class JobKeyIndex:
+    """Hash set of platform job keys - O(1) 'already have this posting?' checks"""
+
+    def __init__(self, links=()):
+        self._keys = set(job_keys(links))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, link):
+        key = job_key(link)
+        return key is not None and key in self._keys
+
+    def add(self, links):
+        self._keys.update(job_keys(links))
+
+    def known_mask(self, links):
+        """Boolean list: link's posting is already in the index"""
+        keys = self._keys
+        return [(key := job_key(link)) is not None and key in keys for link in links]
+
+    def first_mask(self, links):
+        """
+        Boolean list: True for the first link of each posting (and for links
+        without a key). Adds the keys as it goes.
+        """
+        mask = []
+        for link in links:
+            key = job_key(link)
+            mask.append(key is None or key not in self._keys)
+            if key is not None:
+                self._keys.add(key)
+        return mask
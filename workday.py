@@ -0,0 +1,129 @@
+"""
+Generic Workday careers client
+Reads the posting total from the first page, fetches the remaining offsets
+concurrently and stops early at postings already seen in earlier runs
+when the result total has not changed
+"""
+
+import re, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from http_session import get_session
+from agent_state import load_json, save_json
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+PAGE_SIZE = 20          # Workday rejects limits above 20
+MAX_IN_FLIGHT = 4       # Concurrent page requests per tenant
+MAX_POSTINGS = 1000     # Safety cap per tenant
+SEEN_DAYS = 14          # Forget postings not seen for this long
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json'
+}
+
+_fetched = {}   # seen file -> total + seen map of this run's fetch, until its source parsed fine
+_pending = {}   # seen file -> total + seen map to save once the run has been committed
+_lock = threading.Lock()
+
+def jobs_url(host, tenant, site):
+    """cxs search endpoint of a Workday career site"""
+    return f"https://{host}/wday/cxs/{tenant}/{site}/jobs"
+
+def posting_url(host, site, posting):
+    """Public apply link of a posting"""
+    return f"https://{host}/{site}{posting.get('externalPath', '')}"
+
+def posting_id(posting):
+    """Stable id of a posting (its external path)"""
+    return posting.get('externalPath') or posting.get('title', '')
+
+def _seen_file(host, tenant, site):
+    return "workday/" + re.sub(r'[^A-Za-z0-9_.-]', '_', f"{host}_{tenant}_{site}") + ".json"
+
+def _fetch_page(url, search_text, offset, timeout):
+    payload = {
+        "appliedFacets": {},
+        "limit": PAGE_SIZE,
+        "offset": offset,
+        "searchText": search_text
+    }
+    response = get_session().post(url, json=payload, headers=HEADERS, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+def fetch_postings(host, tenant, site, search_text="nurse", max_in_flight=MAX_IN_FLIGHT,
+                   timeout=10, stop_at_seen=True):
+    """
+    All postings of a Workday site matching search_text.
+
+    The first page gives the total; the remaining offsets are fetched in
+    windows of max_in_flight concurrent requests. Search results are ordered
+    by relevance, not date, so a new posting can land on any page: with
+    stop_at_seen, paging only stops early at a window whose last page holds
+    nothing but postings seen in an earlier run when the total is also the
+    one that run saw.
+    """
+    url = jobs_url(host, tenant, site)
+    seen_name = _seen_file(host, tenant, site)
+    state = load_json(seen_name, {})
+    if "seen" not in state:
+        # Files from before the total was stored: a plain seen map
+        state = {"total": None, "seen": state}
+    seen = state["seen"]
+
+    first = _fetch_page(url, search_text, 0, timeout)
+    postings = list(first.get('jobPostings', []))
+    total = min(first.get('total', 0) or 0, MAX_POSTINGS)
+    offsets = list(range(PAGE_SIZE, total, PAGE_SIZE))
+    # Same total as last run: no posting was added, so an all-seen page means nothing new follows
+    can_stop = stop_at_seen and bool(seen) and total == state["total"]
+
+    pages_fetched = 1
+    stopped_early = False
+    if offsets and not (can_stop and postings and all(posting_id(p) in seen for p in postings)):
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            for start in range(0, len(offsets), max_in_flight):
+                window = offsets[start:start + max_in_flight]
+                pages = list(pool.map(lambda offset: _fetch_page(url, search_text, offset, timeout), window))
+                pages_fetched += len(pages)
+                page_postings = [page.get('jobPostings', []) for page in pages]
+                for items in page_postings:
+                    postings.extend(items)
+                if not page_postings[-1]:
+                    break
+                if can_stop and all(posting_id(p) in seen for p in page_postings[-1]):
+                    stopped_early = start + max_in_flight < len(offsets)
+                    break
+    else:
+        stopped_early = bool(offsets)
+
+    # Postings can shift between pages while we read them
+    unique = {}
+    for posting in postings:
+        unique.setdefault(posting_id(posting), posting)
+    postings = list(unique.values())
+
+    now = time.time()
+    seen.update({posting_id(p): now for p in postings})
+    cutoff = now - SEEN_DAYS * 86400
+    with _lock:
+        _fetched[seen_name] = {"total": total, "seen": {pid: ts for pid, ts in seen.items() if ts >= cutoff}}
+
+    print(f"Workday {tenant}/{site}: {len(postings)} postings of {total} "
+          f"({pages_fetched} pages{', stopped at already seen postings' if stopped_early else ''})")
+    return postings
+
+def accept_postings(host, tenant, site):
+    """Stage the seen postings of a site whose source was parsed successfully"""
+    with _lock:
+        seen_name = _seen_file(host, tenant, site)
+        if seen_name in _fetched:
+            _pending[seen_name] = _fetched.pop(seen_name)
+
+def commit_seen_state():
+    """Persist the staged seen postings - call only after the sheet was updated"""
+    with _lock:
+        for seen_name, state in _pending.items():
+            save_json(seen_name, state)
+        _pending.clear()